@@ -92,8 +92,7 @@ class DataManager:
 
         # Check stop loss and take profit
         if self.trade_manager:
-            self.trade_manager.check_stop_loss(trade.price)
-            self.trade_manager.check_take_profit(trade.price)
+            self.trade_manager.check_exits(trade.price, trade.symbol)
 
     async def on_kline(self, kline: OHLCV):
         self.latest_kline = kline
@@ -321,7 +320,10 @@ class DataManager:
             await self.bybit_ws.stop()
 
         if self.news_fetcher:
-            self.news_fetcher.stop_polling()
+            await self.news_fetcher.aclose()
+
+        if self.trade_manager:
+            await self.trade_manager.aclose()
 
         if self.ws_task:
             self.ws_task.cancel()
@@ -1,4 +1,5 @@
 from enum import Enum
+from types import MappingProxyType
 
 
 class RegimeState(str, Enum):
@@ -29,42 +30,49 @@ class OrderSide(str, Enum):
 
 BYBIT_WS_PUBLIC_URL = "wss://stream.bybit.com/v5/public/linear"
 BYBIT_WS_PRIVATE_URL = "wss://stream.bybit.com/v5/private"
+BYBIT_WS_TRADE_URL = "wss://stream.bybit.com/v5/trade"
 BYBIT_REST_URL = "https://api.bybit.com"
 
 BYBIT_WS_TESTNET_PUBLIC_URL = "wss://stream-testnet.bybit.com/v5/public/linear"
 BYBIT_WS_TESTNET_PRIVATE_URL = "wss://stream-testnet.bybit.com/v5/private"
+BYBIT_WS_TESTNET_TRADE_URL = "wss://stream-testnet.bybit.com/v5/trade"
 BYBIT_REST_TESTNET_URL = "https://api-testnet.bybit.com"
 
 EXECUTION_TIMEFRAMES = [Timeframe.FIVE_MINUTE, Timeframe.ONE_MINUTE]
 REGIME_TIMEFRAMES = [Timeframe.FOUR_HOUR, Timeframe.ONE_DAY]
 
-REGIME_PERMISSIONS = {
+_REGIME_PERMISSIONS = {
     RegimeState.RISK_ON: {
         "trading_enabled": True,
         "position_size_multiplier": 1.0,
-        "preferred_trades": [TradeType.LONG],
+        "preferred_trades": (TradeType.LONG,),
         "allow_runners": True,
     },
     RegimeState.RISK_OFF: {
         "trading_enabled": True,
         "position_size_multiplier": 0.5,
-        "preferred_trades": [TradeType.SHORT],
+        "preferred_trades": (TradeType.SHORT,),
         "allow_runners": False,
     },
     RegimeState.DECOUPLED: {
         "trading_enabled": True,
         "position_size_multiplier": 0.75,
-        "preferred_trades": [TradeType.LONG, TradeType.SHORT],
+        "preferred_trades": (TradeType.LONG, TradeType.SHORT),
         "allow_runners": True,
     },
     RegimeState.CHOP: {
         "trading_enabled": False,
         "position_size_multiplier": 0.0,
-        "preferred_trades": [],
+        "preferred_trades": (),
         "allow_runners": False,
     },
 }
 
+# Read-only views so no consumer can mutate the shared per-regime permissions
+REGIME_PERMISSIONS = MappingProxyType({
+    state: MappingProxyType(permissions) for state, permissions in _REGIME_PERMISSIONS.items()
+})
+
 RISK_THRESHOLDS = {
     "max_position_size_usd": 1000,
     "base_risk_percent": 1.0,
@@ -99,4 +107,5 @@ LIQUIDITY_LEVELS = {
     },
     "orderbook_depth_levels": 20,
     "imbalance_threshold": 1.5,
+    "ofi_levels": 10,  # Book levels in the multi-level order flow imbalance vector
 }
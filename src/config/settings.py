@@ -51,6 +51,12 @@ class Settings(BaseSettings):
     bybit_ws_trade_publish_interval_sec: float = Field(default=0.5, description="Trade callback batching window seconds")
     bybit_ws_max_queue: int = Field(default=2000, description="Max queued items (trades/klines). Oldest dropped when full.")
 
+    # --- Order placement ---
+    use_ws_trade_api: bool = Field(default=True, description="Place orders over the persistent WebSocket trade API instead of REST")
+    ws_trade_sender_thread: bool = Field(default=True, description="Run the WebSocket trade session on a dedicated order-sender thread")
+    ws_trade_timeout_secs: float = Field(default=5.0, description="Seconds to wait for a WebSocket order acknowledgement")
+    order_rate_limit_per_min: int = Field(default=90, description="Client-side order rate cap (Bybit allows ~100/min)")
+
     # --- Derived URLs ---
     @property
     def bybit_rest_url(self) -> str:
@@ -71,4 +77,11 @@ class Settings(BaseSettings):
         return BYBIT_WS_TESTNET_PRIVATE_URL if self.bybit_testnet else BYBIT_WS_PRIVATE_URL
 
 
+    @property
+    def bybit_ws_trade_url(self) -> str:
+        from .constants import BYBIT_WS_TESTNET_TRADE_URL, BYBIT_WS_TRADE_URL
+
+        return BYBIT_WS_TESTNET_TRADE_URL if self.bybit_testnet else BYBIT_WS_TRADE_URL
+
+
 settings = Settings()
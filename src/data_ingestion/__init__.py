@@ -1,5 +1,6 @@
 from .bybit_websocket import BybitWebSocketClient
 from .bybit_rest import BybitRESTClient
+from .bybit_ws_trade import BybitWsTradeClient, OrderStatusUnknown
 from .dxy_fetcher import DXYFetcher
 from .btc_dominance_fetcher import BTCDominanceFetcher
 from .news_fetcher import NewsFetcher
@@ -7,6 +8,8 @@ from .news_fetcher import NewsFetcher
 __all__ = [
     "BybitWebSocketClient",
     "BybitRESTClient",
+    "BybitWsTradeClient",
+    "OrderStatusUnknown",
     "DXYFetcher",
     "BTCDominanceFetcher",
     "NewsFetcher",
@@ -4,6 +4,7 @@ import time
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
+from urllib.parse import urlencode
 import httpx
 
 from src.config import settings, Timeframe
@@ -220,3 +221,91 @@ class BybitRESTClient:
         except Exception as e:
             logger.error(f"Error fetching server time: {e}")
             return None
+
+    async def get_instrument_info(self, symbol: str) -> Optional[Dict]:
+        endpoint = "/v5/market/instruments-info"
+        url = f"{self.base_url}{endpoint}"
+
+        params = {
+            "category": "linear",
+            "symbol": symbol
+        }
+
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url, params=params)
+                response.raise_for_status()
+                data = response.json()
+
+                if data.get("retCode") != 0:
+                    logger.error(f"API error: {data.get('retMsg')}")
+                    return None
+
+                items = data.get("result", {}).get("list", [])
+                return items[0] if items else None
+
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error fetching instrument info: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching instrument info: {e}")
+            return None
+
+    async def _signed_get(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """Authenticated GET; returns the response `result` or None on any error"""
+        # The signature covers the query string exactly as sent
+        query = urlencode(params)
+        url = f"{self.base_url}{endpoint}?{query}"
+
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url, headers=self._get_headers(query))
+                response.raise_for_status()
+                data = response.json()
+
+                if data.get("retCode") != 0:
+                    logger.error(f"API error ({endpoint}): {data.get('retMsg')}")
+                    return None
+
+                return data.get("result", {})
+
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error ({endpoint}): {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error ({endpoint}): {e}")
+            return None
+
+    async def get_order(self, symbol: str, order_link_id: str) -> Optional[Dict]:
+        """
+        Look an order up by orderLinkId, in open orders first and then in order history.
+        Returns the order, {} if the exchange has no such order, or None if the lookup failed.
+        """
+        params = {"category": "linear", "symbol": symbol, "orderLinkId": order_link_id}
+
+        for endpoint in ("/v5/order/realtime", "/v5/order/history"):
+            result = await self._signed_get(endpoint, params)
+            if result is None:
+                return None
+            items = result.get("list", [])
+            if items:
+                return items[0]
+
+        return {}
+
+    async def get_position(self, symbol: str) -> Optional[Dict]:
+        """Current position for a symbol ({} when flat), or None if the lookup failed"""
+        result = await self._signed_get("/v5/position/list", {"category": "linear", "symbol": symbol})
+        if result is None:
+            return None
+
+        items = result.get("list", [])
+        return items[0] if items else {}
+
+    async def get_last_closed_pnl(self, symbol: str) -> Optional[Dict]:
+        """Most recent closed-PnL record (exit fill) for a symbol, or None"""
+        result = await self._signed_get(
+            "/v5/position/closed-pnl", {"category": "linear", "symbol": symbol, "limit": 1}
+        )
+        items = (result or {}).get("list", [])
+        return items[0] if items else None
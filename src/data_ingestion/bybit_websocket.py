@@ -1,17 +1,17 @@
 import asyncio
 import inspect
-import json
 import logging
 import random
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
+import orjson
 import websockets
 from websockets.exceptions import ConnectionClosed
 
 from src.config import settings
-from src.models import OHLCV, OrderBook, OrderBookLevel, Trade
+from src.models import OHLCV, OrderBook, Trade
 
 logger = logging.getLogger(__name__)
 
@@ -135,7 +135,7 @@ class BybitWebSocketClient:
 
         subscribe_msg = {"op": "subscribe", "args": channels}
         try:
-            await self.ws.send(json.dumps(subscribe_msg))
+            await self.ws.send(orjson.dumps(subscribe_msg).decode())
             logger.info("Subscribed to channels: %s", channels)
         except Exception as e:
             logger.error("Failed to subscribe: %s", e)
@@ -194,8 +194,10 @@ class BybitWebSocketClient:
         bids_sorted = sorted(self._bids.items(), key=lambda x: x[0], reverse=True)[: self.orderbook_depth]
         asks_sorted = sorted(self._asks.items(), key=lambda x: x[0])[: self.orderbook_depth]
 
-        bids = [OrderBookLevel(price=p, quantity=q) for p, q in bids_sorted]
-        asks = [OrderBookLevel(price=p, quantity=q) for p, q in asks_sorted]
+        # Plain dicts let pydantic-core build the nested levels in one validation pass,
+        # cheaper than constructing (and re-validating) each OrderBookLevel from Python
+        bids = [{"price": p, "quantity": q} for p, q in bids_sorted]
+        asks = [{"price": p, "quantity": q} for p, q in asks_sorted]
 
         return OrderBook(
             symbol=self._orderbook_symbol,
@@ -326,7 +328,7 @@ class BybitWebSocketClient:
     # -----------------------
     async def _process_message(self, message: str) -> None:
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
 
             # bybit public WS uses op pong for ping responses
             if data.get("op") == "pong":
@@ -347,7 +349,7 @@ class BybitWebSocketClient:
             elif "kline" in topic:
                 await self._handle_kline(data)
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error("Failed to decode message: %s", e)
         except Exception:
             logger.exception("Error processing message")
@@ -355,7 +357,7 @@ class BybitWebSocketClient:
     async def _heartbeat(self) -> None:
         while self.is_running and self.ws:
             try:
-                await self.ws.send(json.dumps({"op": "ping"}))
+                await self.ws.send('{"op":"ping"}')
                 await asyncio.sleep(self.ping_interval_sec)
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,411 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Optional
+
+import orjson
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from src.config import settings, OrderSide
+from src.utils.rate_limiter import AsyncTokenBucket
+from .bybit_rest import BybitRESTClient
+
+logger = logging.getLogger(__name__)
+
+# retCode Bybit returns when the order rate limit is exceeded ("Too many visits")
+_RATE_LIMITED = 10006
+
+# Final order states in which nothing filled
+_DEAD_ORDER_STATUSES = frozenset({"Rejected", "Cancelled", "Deactivated"})
+
+
+class OrderStatusUnknown(ConnectionError):
+    """An order was sent but neither its acknowledgement nor a REST lookup confirmed its outcome"""
+
+    def __init__(self, order_link_id: str):
+        super().__init__(f"Outcome of order {order_link_id} is unknown")
+        self.order_link_id = order_link_id
+
+
+def _fmt_decimal(value: Decimal) -> str:
+    """Plain decimal string for order fields (never exponent notation)"""
+    return format(value.normalize(), "f")
+
+
+@dataclass(frozen=True)
+class _InstrumentFilters:
+    """Order size and price increments of one instrument (from /v5/market/instruments-info)"""
+    qty_step: Decimal
+    min_qty: Decimal
+    tick_size: Decimal
+
+    @classmethod
+    def from_info(cls, info: Dict[str, Any]) -> "_InstrumentFilters":
+        lot, price = info["lotSizeFilter"], info["priceFilter"]
+        return cls(Decimal(lot["qtyStep"]), Decimal(lot["minOrderQty"]), Decimal(price["tickSize"]))
+
+    def round_qty(self, qty: float) -> Decimal:
+        """Round down to qtyStep, so rounding never increases the risk taken"""
+        return (Decimal(str(qty)) / self.qty_step).to_integral_value(ROUND_DOWN) * self.qty_step
+
+    def round_price(self, price: float) -> Decimal:
+        return (Decimal(str(price)) / self.tick_size).to_integral_value(ROUND_HALF_UP) * self.tick_size
+
+
+class BybitWsTradeClient:
+    """
+    Bybit V5 WebSocket trade API client
+
+    - One authenticated connection is opened on first use and kept warm, so order
+      placement skips the per-request TCP+TLS setup and connection churn of REST
+    - Each request's reqId is the order's orderLinkId; the reader task resolves the
+      matching future when the acknowledgement arrives
+    - Pending requests fail fast if the connection drops; the next order reconnects.
+      An order whose ack timed out or was lost is looked up by orderLinkId over REST,
+      since it may have filled regardless
+    - Orders are paced by a local token bucket below the exchange limit, which is
+      paused until the limit window resets whenever Bybit reports it exhausted
+    - qty is rounded down to the instrument's qtyStep and SL/TP to its tickSize
+      (filters are loaded once per symbol over REST); orders below minOrderQty are
+      rejected locally
+    - With use_sender_thread, the session lives on its own event loop in a dedicated
+      thread; callers only hand the request over, so order I/O and ack parsing never
+      run on (or stall) the loop that receives market data
+    """
+
+    def __init__(
+        self,
+        category: str = "linear",
+        use_sender_thread: Optional[bool] = None,
+        rest_client: Optional[BybitRESTClient] = None,
+    ):
+        self.ws_url = settings.bybit_ws_trade_url
+        self.api_key = settings.bybit_api_key
+        self.api_secret = settings.bybit_api_secret
+        self.category = category
+        self.recv_window = 5000
+        self.rest = rest_client or BybitRESTClient()
+        self._filters: Dict[str, _InstrumentFilters] = {}
+
+        self.ack_timeout_sec: float = float(settings.ws_trade_timeout_secs)
+        self.ping_interval_sec: float = float(getattr(settings, "bybit_ws_ping_interval_sec", 20))
+        self.connect_timeout_sec: float = float(getattr(settings, "bybit_ws_connect_timeout_sec", 10))
+
+        # Small burst so simultaneous exits aren't serialized; sustained rate stays under the cap
+        self._order_bucket = AsyncTokenBucket(rate=settings.order_rate_limit_per_min, per=60.0, burst=10)
+
+        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._connect_lock = asyncio.Lock()
+
+        self._reader_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        # Dedicated order-sender loop, started on the first order
+        if use_sender_thread is None:
+            use_sender_thread = settings.ws_trade_sender_thread
+        self.use_sender_thread = use_sender_thread
+        self._sender_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sender_thread: Optional[threading.Thread] = None
+
+    def _auth_message(self) -> Dict[str, Any]:
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(
+            bytes(self.api_secret, "utf-8"),
+            f"GET/realtime{expires}".encode("utf-8"),
+            hashlib.sha256
+        ).hexdigest()
+        return {"op": "auth", "args": [self.api_key, expires, signature]}
+
+    async def connect(self) -> bool:
+        try:
+            ws = await asyncio.wait_for(
+                websockets.connect(self.ws_url, ping_interval=None),
+                timeout=self.connect_timeout_sec,
+            )
+            await ws.send(orjson.dumps(self._auth_message()).decode())
+            reply = orjson.loads(await asyncio.wait_for(ws.recv(), timeout=self.connect_timeout_sec))
+            if reply.get("retCode") != 0:
+                logger.error("WebSocket trade auth failed: %s", reply.get("retMsg"))
+                await ws.close()
+                return False
+        except Exception as e:
+            logger.error("Failed to connect to WebSocket trade API: %s", e)
+            return False
+
+        self.ws = ws
+        self._reader_task = asyncio.create_task(self._reader(ws))
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(ws))
+        logger.info("Connected to Bybit WebSocket trade API: %s", self.ws_url)
+        return True
+
+    async def _ensure_connected(self) -> bool:
+        if self.ws is not None:
+            return True
+        async with self._connect_lock:
+            return self.ws is not None or await self.connect()
+
+    async def _reader(self, ws) -> None:
+        try:
+            async for message in ws:
+                try:
+                    data = orjson.loads(message)
+                except orjson.JSONDecodeError as e:
+                    logger.error("Failed to decode trade message: %s", e)
+                    continue
+
+                future = self._pending.get(data.get("reqId"))
+                if future is not None and not future.done():
+                    future.set_result(data)
+        except ConnectionClosed:
+            logger.warning("WebSocket trade connection closed")
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("WebSocket trade reader error")
+        finally:
+            self._drop_connection(ws)
+
+    async def _heartbeat(self, ws) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.ping_interval_sec)
+                await ws.send('{"op":"ping"}')
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("WebSocket trade heartbeat error: %s", e)
+                break
+
+    def _drop_connection(self, ws) -> None:
+        """Forget a dead connection and fail every request still waiting on it"""
+        if self.ws is ws:
+            self.ws = None
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("WebSocket trade connection lost"))
+        self._pending.clear()
+
+    def _track_rate_limit(self, ret_code: Any, header: Dict[str, Any]) -> None:
+        """Pause order sending until the window resets once Bybit reports the limit exhausted"""
+        if ret_code != _RATE_LIMITED and header.get("X-Bapi-Limit-Status") != "0":
+            return
+
+        reset_ms = header.get("X-Bapi-Limit-Reset-Timestamp")
+        delay = max(0.0, int(reset_ms) / 1000 - time.time()) if reset_ms else 1.0
+        self._order_bucket.penalize(delay)
+        logger.warning("Bybit order rate limit reached, pausing orders for %.1fs", delay)
+
+    async def _instrument_filters(self, symbol: str) -> Optional[_InstrumentFilters]:
+        """Qty/price filters for a symbol, fetched on first use and cached"""
+        filters = self._filters.get(symbol)
+        if filters is None:
+            info = await self.rest.get_instrument_info(symbol)
+            try:
+                filters = _InstrumentFilters.from_info(info)
+            except (TypeError, KeyError, ArithmeticError) as e:
+                logger.error("No usable instrument filters for %s: %s", symbol, e)
+                return None
+            self._filters[symbol] = filters
+        return filters
+
+    def _start_sender_thread(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        self._sender_thread = threading.Thread(
+            target=loop.run_forever, name="bybit-order-sender", daemon=True
+        )
+        self._sender_thread.start()
+        self._sender_loop = loop
+        return loop
+
+    async def _on_sender(self, coro):
+        """Run a coroutine on the sender loop and await its result from the caller's loop"""
+        loop = self._sender_loop or self._start_sender_thread()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def send_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        qty: float,
+        reduce_only: bool = False,
+        cl_order_id: Optional[str] = None,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Place a market order and wait for its acknowledgement.
+
+        Optional stop_loss/take_profit are attached to the resulting position in
+        the same request. qty is rounded down to the instrument's qtyStep and
+        SL/TP to its tickSize. Returns {"orderId", "orderLinkId", "qty",
+        "ack_time"} (qty as sent) or None if the order could not be placed
+        (errors are logged). Raises OrderStatusUnknown if the order was sent,
+        no acknowledgement arrived, and its outcome could not be looked up.
+        """
+        args = (symbol, side, qty, reduce_only, cl_order_id, stop_loss, take_profit)
+        if self.use_sender_thread:
+            return await self._on_sender(self._send_order(*args))
+        return await self._send_order(*args)
+
+    async def _send_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        qty: float,
+        reduce_only: bool,
+        cl_order_id: Optional[str],
+        stop_loss: Optional[float],
+        take_profit: Optional[float],
+    ) -> Optional[Dict[str, Any]]:
+        filters = await self._instrument_filters(symbol)
+        if filters is None:
+            return None
+
+        order_qty = filters.round_qty(qty)
+        if order_qty < filters.min_qty:
+            logger.error(
+                "Order qty %s %s is below the minimum %s after rounding to step %s",
+                qty, symbol, filters.min_qty, filters.qty_step
+            )
+            return None
+
+        await self._order_bucket.acquire()
+        if not await self._ensure_connected():
+            return None
+
+        cl_order_id = cl_order_id or uuid.uuid4().hex
+        order = {
+            "category": self.category,
+            "symbol": symbol,
+            "side": side.value,
+            "orderType": "Market",
+            "qty": _fmt_decimal(order_qty),
+            "orderLinkId": cl_order_id,
+        }
+        if reduce_only:
+            order["reduceOnly"] = True
+        if stop_loss:
+            order["stopLoss"] = _fmt_decimal(filters.round_price(stop_loss))
+        if take_profit:
+            order["takeProfit"] = _fmt_decimal(filters.round_price(take_profit))
+
+        request = {
+            "reqId": cl_order_id,
+            "header": {
+                "X-BAPI-TIMESTAMP": str(int(time.time() * 1000)),
+                "X-BAPI-RECV-WINDOW": str(self.recv_window),
+            },
+            "op": "order.create",
+            "args": [order],
+        }
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[cl_order_id] = future
+        try:
+            await self.ws.send(orjson.dumps(request).decode())
+            ack = await asyncio.wait_for(future, timeout=self.ack_timeout_sec)
+        except asyncio.TimeoutError:
+            logger.error("No acknowledgement for order %s within %.1fs", cl_order_id, self.ack_timeout_sec)
+            return await self.lookup_order(symbol, cl_order_id, float(order_qty))
+        except Exception as e:
+            # The request may have left before the connection failed
+            logger.error("Error sending order %s: %s", cl_order_id, e)
+            return await self.lookup_order(symbol, cl_order_id, float(order_qty))
+        finally:
+            self._pending.pop(cl_order_id, None)
+
+        header = ack.get("header") or {}
+        self._track_rate_limit(ack.get("retCode"), header)
+        if ack.get("retCode") != 0:
+            logger.error("Order %s rejected: %s", cl_order_id, ack.get("retMsg"))
+            return None
+
+        # Exchange-side timestamp of the acknowledgement (falls back to local time)
+        ack_ms = header.get("Timenow")
+        data = ack.get("data") or {}
+        return {
+            "orderId": data.get("orderId"),
+            "orderLinkId": data.get("orderLinkId", cl_order_id),
+            "qty": float(order_qty),
+            "ack_time": datetime.fromtimestamp(int(ack_ms) / 1000) if ack_ms else datetime.now(),
+        }
+
+    async def lookup_order(
+        self,
+        symbol: str,
+        cl_order_id: str,
+        qty: float,
+        attempts: int = 3,
+        retry_delay: float = 1.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve an order whose acknowledgement never arrived by its orderLinkId.
+
+        Returns the same shape as send_order for an order that was placed (qty is
+        the filled qty once known), None if the exchange has no record of it after
+        `attempts` lookups or it died unfilled, and raises OrderStatusUnknown if
+        the lookup itself keeps failing.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(retry_delay)
+            order = await self.rest.get_order(symbol, cl_order_id)
+            if order:
+                break
+        else:
+            if order is None:
+                raise OrderStatusUnknown(cl_order_id)
+            logger.warning("Order %s was never placed", cl_order_id)
+            return None
+
+        filled = float(order.get("cumExecQty") or 0)
+        if not filled and order.get("orderStatus") in _DEAD_ORDER_STATUSES:
+            logger.warning("Order %s ended %s without fills", cl_order_id, order.get("orderStatus"))
+            return None
+
+        logger.info("Order %s found by lookup (status %s)", cl_order_id, order.get("orderStatus"))
+        updated_ms = order.get("updatedTime")
+        return {
+            "orderId": order.get("orderId"),
+            "orderLinkId": cl_order_id,
+            "qty": filled or qty,
+            "ack_time": datetime.fromtimestamp(int(updated_ms) / 1000) if updated_ms else datetime.now(),
+        }
+
+    async def aclose(self) -> None:
+        """Close the trade connection, stop background tasks and the sender thread"""
+        loop, thread = self._sender_loop, self._sender_thread
+        if loop is None:
+            await self._close_session()
+            return
+
+        await self._on_sender(self._close_session())
+        self._sender_loop = self._sender_thread = None
+        loop.call_soon_threadsafe(loop.stop)
+        await asyncio.to_thread(thread.join, 5.0)
+        if not thread.is_alive():
+            loop.close()
+
+    async def _close_session(self) -> None:
+        ws = self.ws
+        for task in (self._heartbeat_task, self._reader_task):
+            if task and not task.done():
+                task.cancel()
+        if ws is not None:
+            self._drop_connection(ws)
+            try:
+                await ws.close()
+            except Exception:
+                pass
@@ -4,7 +4,7 @@ Falls back to EUR/USD inverse as DXY proxy
 """
 
 import logging
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import httpx
 import asyncio
@@ -32,6 +32,30 @@ class DXYFetcher:
         self.max_retries = 3
         self.base_delay = 2  # Base delay in seconds for exponential backoff
 
+        # Single-flight: concurrent callers of the same fetch share one upstream request
+        self._inflight: Dict[Any, asyncio.Task] = {}
+
+    async def _single_flight(self, key: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fetch() once per key at a time; callers arriving while it is in
+        progress await the same request instead of issuing their own.
+        The fetch runs in its own task that no caller owns, so cancelling any
+        one caller (the first included) never cancels it for the others
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, key: Any, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved in case every caller was cancelled
+
     async def _retry_request(self, client: httpx.AsyncClient, url: str, params: dict, max_retries: int = 3):
         """
         Make HTTP request with exponential backoff retry logic
@@ -153,6 +177,13 @@ class DXYFetcher:
     async def get_current_value(self) -> Optional[DXYData]:
         """
         Get current DXY value
+        Concurrent callers share a single in-flight upstream fetch
+        """
+        return await self._single_flight("get_current_value", self._fetch_current_value)
+
+    async def _fetch_current_value(self) -> Optional[DXYData]:
+        """
+        Fetch current DXY value
         Priority: Alpha Vantage -> Yahoo Finance -> EUR/USD proxy
         """
         # Try Alpha Vantage first (most reliable if API key is configured)
@@ -299,6 +330,13 @@ class DXYFetcher:
         outputsize: int = 24
     ) -> List[DXYData]:
         """Get historical DXY time series"""
+        return await self._single_flight(
+            ("get_time_series", interval, outputsize),
+            lambda: self._fetch_time_series(interval, outputsize)
+        )
+
+    async def _fetch_time_series(self, interval: str, outputsize: int) -> List[DXYData]:
+        """Fetch historical DXY time series from Yahoo Finance"""
         url = f"{self.yahoo_base_url}/{self.symbol}"
 
         params = {
@@ -7,14 +7,22 @@ import logging
 from typing import List, Optional, Callable
 from datetime import datetime, timedelta
 import asyncio
+import random
+from collections import deque
+from itertools import chain
 import httpx
-import hashlib
+import orjson
+import xxhash
 
 from src.config import settings
 from src.models import NewsItem
+from src.utils.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
+# fromisoformat accepts NewsData.io's "2024-01-06 12:30:45" as-is (any single-char separator)
+_parse_ts = datetime.fromisoformat
+
 
 class NewsFetcher:
     """
@@ -28,165 +36,185 @@ class NewsFetcher:
             "bitcoin", "BTC", "cryptocurrency", "crypto", "blockchain",
             "federal reserve", "fed", "interest rate", "inflation", "USD"
         ]
+        # Prebuilt request params for the steady-state polling path; copied only when overridden
+        self._default_query = " OR ".join(self.crypto_keywords[:3])  # Limit to avoid query too long
+        self._latest_params = {
+            "apikey": self.api_key,
+            "q": self._default_query,
+            "language": "en",
+            "size": 10,  # Free tier max is 10
+        }
+        self._crypto_params = {
+            "apikey": self.api_key,
+            "q": "bitcoin OR cryptocurrency OR crypto",
+            "language": "en",
+            "category": "technology,business",
+            "size": 10,
+        }
+
         self.news_callback: Optional[Callable] = None
         self.is_running = False
+        # Bounded FIFO of seen IDs; the set mirrors the deque for O(1) membership
+        self.max_seen_articles = 1000
         self.seen_articles = set()
+        self._seen_order = deque(maxlen=self.max_seen_articles)
         self.poll_interval = 600  # 10 minutes (to stay within free tier limits)
+        # Fetch methods run concurrently each poll cycle; each costs one request of the daily quota
+        self.poll_endpoints: List[str] = ["fetch_latest_news"]
+
+        # Quota guard for every outgoing request: 200/day with small bursts for manual fetches
+        self._bucket = AsyncTokenBucket(rate=200, per=86400, burst=5)
+        self._rate_limit_strikes = 0  # Consecutive 429s, drives exponential cool-down
+        self.rate_limit_base_delay = 60.0
+        self.rate_limit_max_delay = 3600.0  # Cap on the exponential cool-down
+
+        # Long-lived client so polls reuse pooled keep-alive connections
+        # instead of paying a fresh TCP+TLS handshake per request
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=15.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=16,
+                max_connections=64,
+                keepalive_expiry=120.0
+            )
+        )
 
     def on_news(self, callback: Callable):
         """Register callback for new articles"""
         self.news_callback = callback
 
-    def _generate_article_id(self, title: str, published_at: str) -> str:
-        """Generate unique ID for article deduplication"""
-        unique_string = f"{title}{published_at}"
-        return hashlib.md5(unique_string.encode()).hexdigest()
+    def _mark_seen(self, article_id: str) -> bool:
+        """Record an article ID, evicting the oldest once full. Returns False if already seen"""
+        if article_id in self.seen_articles:
+            return False
 
-    async def fetch_latest_news(
-        self,
-        query: Optional[str] = None,
-        language: str = "en",
-        page_size: int = 10
-    ) -> List[NewsItem]:
+        if len(self._seen_order) == self.max_seen_articles:
+            self.seen_articles.discard(self._seen_order[0])
+
+        self._seen_order.append(article_id)
+        self.seen_articles.add(article_id)
+        return True
+
+    def _on_rate_limited(self, response: httpx.Response):
         """
-        Fetch latest news from NewsData.io
-        Note: Free tier limited to 10 results per request
+        Back off after a 429: honour Retry-After, escalating exponentially
+        (with jitter, capped at rate_limit_max_delay) on consecutive rate limits.
+        429s from requests already in flight when the cool-down started don't escalate it
         """
-        endpoint = "/news"
-        url = f"{self.base_url}{endpoint}"
+        if self._bucket.blocked:
+            return
 
-        # Build search query
-        if not query:
-            # Use crypto and macro keywords
-            query = " OR ".join(self.crypto_keywords[:3])  # Limit to avoid query too long
+        try:
+            retry_after = float(response.headers.get("Retry-After", self.rate_limit_base_delay))
+        except ValueError:
+            retry_after = self.rate_limit_base_delay
 
-        params = {
-            "apikey": self.api_key,
-            "q": query,
-            "language": language,
-            "size": min(page_size, 10),  # Free tier max is 10
-        }
+        backoff = min(self.rate_limit_base_delay * (2 ** self._rate_limit_strikes), self.rate_limit_max_delay)
+        delay = max(retry_after, backoff) + random.uniform(0, 1)
+        self._rate_limit_strikes += 1
+
+        self._bucket.penalize(delay)
+        logger.warning("NewsData.io rate limited, pausing requests for %.0fs", delay)
+
+    def _generate_article_id(self, title: str, published_at: str) -> str:
+        """
+        Generate unique ID for article deduplication
+        Non-cryptographic xxh3 is plenty for in-process dedup and far cheaper than MD5
+        """
+        return xxhash.xxh3_64_hexdigest(f"{title}\x00{published_at}".encode())
 
+    async def _get_articles(
+        self,
+        params: dict,
+        category: Optional[str],
+        impact_level: str,
+        context: str
+    ) -> List[NewsItem]:
+        """
+        GET the /news endpoint and parse results into NewsItems
+        Shared by all public fetch methods; `context` labels log messages
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-
-                # Check for API errors
-                if data.get("status") == "error":
-                    error_msg = data.get("results", {}).get("message", "Unknown error")
-                    logger.error(f"NewsData.io API error: {error_msg}")
-                    return []
-
-                results = data.get("results", [])
-                news_items = []
-
-                for article in results:
-                    # NewsData.io format
-                    published_at = article.get("pubDate", "")
-                    title = article.get("title", "")
-
-                    article_id = self._generate_article_id(title, published_at)
-
-                    # Parse timestamp
-                    try:
-                        if published_at:
-                            # NewsData.io uses format: "2024-01-06 12:30:45"
-                            timestamp = datetime.fromisoformat(published_at.replace(" ", "T"))
-                        else:
-                            timestamp = datetime.now()
-                    except Exception:
-                        timestamp = datetime.now()
-
-                    news_item = NewsItem(
-                        id=article_id,
-                        timestamp=timestamp,
-                        title=title,
-                        description=article.get("description") or article.get("content"),
-                        source=article.get("source_id", "Unknown"),
-                        url=article.get("link"),
-                        category=None,  # Will be set by classifier
-                        sentiment_score=None,  # Will be set by classifier
-                        impact_level="LOW"  # Will be set by classifier
-                    )
-                    news_items.append(news_item)
-
-                logger.info(f"Fetched {len(news_items)} news items from NewsData.io")
-                return news_items
+            await self._bucket.acquire()
+            response = await self._client.get("/news", params=params)
+            response.raise_for_status()
+            self._rate_limit_strikes = 0
+            data = orjson.loads(response.content)
+
+            # Check for API errors
+            if data.get("status") == "error":
+                error_msg = data.get("results", {}).get("message", "Unknown error")
+                logger.error("NewsData.io API error %s: %s", context, error_msg)
+                return []
+
+            news_items = []
+            for article in data.get("results", []):
+                # NewsData.io format
+                published_at = article.get("pubDate", "")
+                title = article.get("title", "")
+
+                try:
+                    timestamp = _parse_ts(published_at) if published_at else datetime.now()
+                except (ValueError, TypeError):
+                    timestamp = datetime.now()
+
+                news_items.append(NewsItem(
+                    id=self._generate_article_id(title, published_at),
+                    timestamp=timestamp,
+                    title=title,
+                    description=article.get("description") or article.get("content"),
+                    source=article.get("source_id", "Unknown"),
+                    url=article.get("link"),
+                    category=category,
+                    sentiment_score=None,  # Will be set by classifier
+                    impact_level=impact_level
+                ))
+
+            logger.info("Fetched %s news items from NewsData.io (%s)", len(news_items), context)
+            return news_items
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
-                logger.error("NewsData.io rate limit exceeded - waiting before retry")
+                logger.error("NewsData.io rate limit exceeded %s", context)
+                self._on_rate_limited(e.response)
             else:
-                logger.error(f"HTTP error fetching news: {e}")
+                logger.error("HTTP error %s: %s", context, e)
             return []
         except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching news: {e}")
+            logger.error("HTTP error %s: %s", context, e)
             return []
         except Exception as e:
-            logger.error(f"Error fetching news: {e}")
+            logger.error("Error %s: %s", context, e)
             return []
 
-    async def fetch_crypto_news(self, page_size: int = 10) -> List[NewsItem]:
+    async def fetch_latest_news(
+        self,
+        query: Optional[str] = None,
+        language: str = "en",
+        page_size: int = 10
+    ) -> List[NewsItem]:
         """
-        Fetch crypto-specific news
+        Fetch latest news from NewsData.io
+        Note: Free tier limited to 10 results per request
         """
-        endpoint = "/news"
-        url = f"{self.base_url}{endpoint}"
+        params = self._latest_params
+        size = min(page_size, 10)  # Free tier max is 10
+        if query or language != params["language"] or size != params["size"]:
+            params = {**params, "q": query or self._default_query, "language": language, "size": size}
 
-        params = {
-            "apikey": self.api_key,
-            "q": "bitcoin OR cryptocurrency OR crypto",
-            "language": "en",
-            "category": "technology,business",
-            "size": min(page_size, 10),
-        }
+        # Category and impact will be set by classifier
+        return await self._get_articles(params, None, "LOW", "fetching news")
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("status") == "error":
-                    logger.error(f"API error: {data.get('results', {})}")
-                    return []
-
-                results = data.get("results", [])
-                news_items = []
-
-                for article in results:
-                    published_at = article.get("pubDate", "")
-                    title = article.get("title", "")
-                    article_id = self._generate_article_id(title, published_at)
-
-                    try:
-                        timestamp = datetime.fromisoformat(published_at.replace(" ", "T"))
-                    except Exception:
-                        timestamp = datetime.now()
-
-                    news_item = NewsItem(
-                        id=article_id,
-                        timestamp=timestamp,
-                        title=title,
-                        description=article.get("description") or article.get("content"),
-                        source=article.get("source_id", "Unknown"),
-                        url=article.get("link"),
-                        category="crypto",
-                        sentiment_score=None,
-                        impact_level="MEDIUM"
-                    )
-                    news_items.append(news_item)
-
-                return news_items
+    async def fetch_crypto_news(self, page_size: int = 10) -> List[NewsItem]:
+        """
+        Fetch crypto-specific news
+        """
+        params = self._crypto_params
+        if page_size < params["size"]:
+            params = {**params, "size": page_size}
 
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching crypto news: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching crypto news: {e}")
-            return []
+        return await self._get_articles(params, "crypto", "MEDIUM", "fetching crypto news")
 
     async def fetch_top_headlines(
         self,
@@ -198,9 +226,6 @@ class NewsFetcher:
         Fetch top headlines by category
         NewsData.io supports: business, technology, politics, etc.
         """
-        endpoint = "/news"
-        url = f"{self.base_url}{endpoint}"
-
         params = {
             "apikey": self.api_key,
             "country": country,
@@ -209,88 +234,73 @@ class NewsFetcher:
             "size": min(page_size, 10),
         }
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("status") == "error":
-                    logger.error(f"API error: {data.get('results', {})}")
-                    return []
-
-                results = data.get("results", [])
-                news_items = []
-
-                for article in results:
-                    published_at = article.get("pubDate", "")
-                    title = article.get("title", "")
-                    article_id = self._generate_article_id(title, published_at)
-
-                    try:
-                        timestamp = datetime.fromisoformat(published_at.replace(" ", "T"))
-                    except Exception:
-                        timestamp = datetime.now()
-
-                    news_item = NewsItem(
-                        id=article_id,
-                        timestamp=timestamp,
-                        title=title,
-                        description=article.get("description") or article.get("content"),
-                        source=article.get("source_id", "Unknown"),
-                        url=article.get("link"),
-                        category=category,
-                        sentiment_score=None,
-                        impact_level="MEDIUM"
-                    )
-                    news_items.append(news_item)
-
-                return news_items
+        return await self._get_articles(params, category, "MEDIUM", "fetching headlines")
 
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching headlines: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching headlines: {e}")
-            return []
+    async def poll_all(self) -> List[NewsItem]:
+        """
+        Run every fetch method in `poll_endpoints` concurrently on the shared client
+        Failed endpoints are logged and skipped
+        """
+        results = await asyncio.gather(
+            *(getattr(self, name)() for name in self.poll_endpoints),
+            return_exceptions=True
+        )
+
+        for name, result in zip(self.poll_endpoints, results):
+            if isinstance(result, Exception):
+                logger.error("Error polling %s: %s", name, result)
+
+        return list(chain.from_iterable(
+            result for result in results if not isinstance(result, BaseException)
+        ))
 
     async def start_polling(self, interval: int = 600):
         """
         Start polling for news
         Default: 600s (10 minutes) to stay within free tier limits (200 req/day)
+        Polls are scheduled on a fixed cadence, so fetch latency doesn't add drift
         """
         self.is_running = True
         self.poll_interval = interval
 
-        logger.info(f"Starting news polling (interval: {interval}s)")
+        logger.info("Starting news polling (interval: %ss)", interval)
+
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
 
         while self.is_running:
             try:
-                news_items = await self.fetch_latest_news()
+                news_items = await self.poll_all()
 
                 # Process new articles
                 for item in news_items:
-                    if item.id not in self.seen_articles:
-                        self.seen_articles.add(item.id)
-
-                        if self.news_callback:
-                            await self.news_callback(item)
+                    if self._mark_seen(item.id) and self.news_callback:
+                        await self.news_callback(item)
 
-                # Cleanup old seen articles (keep last 1000)
-                if len(self.seen_articles) > 1000:
-                    self.seen_articles = set(list(self.seen_articles)[-1000:])
+            except Exception as e:
+                logger.error("Error in news polling loop: %s", e)
 
-                await asyncio.sleep(self.poll_interval)
+            # Sleep only the remainder of the current interval
+            next_tick += self.poll_interval
+            delay = next_tick - loop.time()
+            if delay <= 0:
+                # Skip missed ticks rather than firing catch-up polls back to back
+                logger.warning("News polling fell behind by %.1fs", -delay)
+                next_tick = loop.time()
+                delay = 0.0
 
-            except Exception as e:
-                logger.error(f"Error in news polling loop: {e}")
-                await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(delay)
 
     def stop_polling(self):
         """Stop the news polling loop"""
         self.is_running = False
         logger.info("Stopping news polling")
 
+    async def aclose(self):
+        """Stop polling and release pooled HTTP connections"""
+        self.stop_polling()
+        await self._client.aclose()
+
     async def search_news(
         self,
         keywords: List[str],
@@ -303,9 +313,6 @@ class NewsFetcher:
         """
         query = " OR ".join(keywords[:3])  # Limit to avoid too long query
 
-        endpoint = "/news"
-        url = f"{self.base_url}{endpoint}"
-
         params = {
             "apikey": self.api_key,
             "q": query,
@@ -317,47 +324,4 @@ class NewsFetcher:
         if from_date or to_date:
             logger.warning("NewsData.io free tier doesn't support date filtering")
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("status") == "error":
-                    logger.error(f"API error: {data.get('results', {})}")
-                    return []
-
-                results = data.get("results", [])
-                news_items = []
-
-                for article in results:
-                    published_at = article.get("pubDate", "")
-                    title = article.get("title", "")
-                    article_id = self._generate_article_id(title, published_at)
-
-                    try:
-                        timestamp = datetime.fromisoformat(published_at.replace(" ", "T"))
-                    except Exception:
-                        timestamp = datetime.now()
-
-                    news_item = NewsItem(
-                        id=article_id,
-                        timestamp=timestamp,
-                        title=title,
-                        description=article.get("description") or article.get("content"),
-                        source=article.get("source_id", "Unknown"),
-                        url=article.get("link"),
-                        category=None,
-                        sentiment_score=None,
-                        impact_level="LOW"
-                    )
-                    news_items.append(news_item)
-
-                return news_items
-
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error searching news: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error searching news: {e}")
-            return []
+        return await self._get_articles(params, None, "LOW", "searching news")
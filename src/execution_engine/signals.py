@@ -4,14 +4,20 @@ Generates entry and exit signals based on structure, orderflow, and liquidity
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import math
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Dict, Any
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
+import numpy as np
 
 from src.models import OHLCV, Trade, OrderBook, RegimeOutput
 from src.liquidity_engine import LiquidityLevel
 from src.capital_flow import CapitalFlowSignal
+from src.utils.jit import njit, NUMBA_AVAILABLE
+from src.utils.kline_buffer import KlineBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +30,7 @@ class SignalType(str, Enum):
     NO_SIGNAL = "NO_SIGNAL"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionSignal:
     """Trade execution signal"""
     signal_type: SignalType
@@ -41,51 +47,115 @@ class ExecutionSignal:
             self.supporting_factors = []
 
 
+def _bracket_levels(levels: List[LiquidityLevel], price: float):
+    """
+    Single pass over liquidity levels around `price`.
+    Returns (min_above, max_above, min_below, max_below); None where no level exists.
+    Levels exactly at `price` belong to neither side.
+    """
+    min_above = math.inf
+    max_above = -math.inf
+    min_below = math.inf
+    max_below = -math.inf
+
+    for level in levels:
+        p = level.price
+        if p > price:
+            if p < min_above:
+                min_above = p
+            if p > max_above:
+                max_above = p
+        elif p < price:
+            if p < min_below:
+                min_below = p
+            if p > max_below:
+                max_below = p
+
+    if min_above == math.inf:
+        min_above = max_above = None
+    if max_below == -math.inf:
+        min_below = max_below = None
+
+    return min_above, max_above, min_below, max_below
+
+
+@njit(cache=True)
+def _detect_swings(high, low, limit, out_high, out_low):
+    """
+    Scan newest-to-oldest for swing highs/lows, stopping once `limit` of each are found.
+    Writes indices newest-first into out_high/out_low and returns (n_high, n_low).
+    """
+    n_high = 0
+    n_low = 0
+    for i in range(len(high) - 2, 0, -1):
+        if n_high < limit and high[i] > high[i - 1] and high[i] > high[i + 1]:
+            out_high[n_high] = i
+            n_high += 1
+        if n_low < limit and low[i] < low[i - 1] and low[i] < low[i + 1]:
+            out_low[n_low] = i
+            n_low += 1
+        if n_high == limit and n_low == limit:
+            break
+    return n_high, n_low
+
+
 class MarketStructure:
     """Tracks market structure (highs, lows, breaks)"""
 
+    __slots__ = ("swing_highs", "swing_lows", "trend", "_high_idx", "_low_idx")
+
     def __init__(self):
-        self.swing_highs: List[float] = []
-        self.swing_lows: List[float] = []
+        # Bounded to the 10 most recent swings; appends evict the oldest in O(1)
+        self.swing_highs: Deque[float] = deque(maxlen=10)
+        self.swing_lows: Deque[float] = deque(maxlen=10)
         self.trend: str = "NEUTRAL"  # BULLISH, BEARISH, NEUTRAL
 
-    def update(self, klines: List[OHLCV]):
-        """Update market structure from klines"""
-        if len(klines) < 3:
-            return
+        # Scratch index buffers for the JIT swing scan
+        self._high_idx = np.empty(self.swing_highs.maxlen, dtype=np.int64)
+        self._low_idx = np.empty(self.swing_lows.maxlen, dtype=np.int64)
 
-        # Simple swing high/low detection
-        for i in range(1, len(klines) - 1):
-            current = klines[i]
-            prev = klines[i - 1]
-            next_candle = klines[i + 1]
+    def update(self, highs: np.ndarray, lows: np.ndarray):
+        """Update market structure from chronological high/low arrays"""
+        if len(highs) < 3:
+            return
 
-            # Swing high: higher than both neighbors
-            if current.high > prev.high and current.high > next_candle.high:
-                self.swing_highs.append(current.high)
-                if len(self.swing_highs) > 10:
-                    self.swing_highs.pop(0)
+        # Swing high: higher than both neighbors. Swing low: lower than both neighbors.
+        # Only the newest swings can survive in the bounded deques, so only those are appended.
+        if NUMBA_AVAILABLE:
+            n_high, n_low = _detect_swings(highs, lows, self.swing_highs.maxlen, self._high_idx, self._low_idx)
+            self.swing_highs.extend(highs[self._high_idx[:n_high][::-1]].tolist())
+            self.swing_lows.extend(lows[self._low_idx[:n_low][::-1]].tolist())
+        else:
+            mid_highs = highs[1:-1]
+            high_idx = np.flatnonzero((mid_highs > highs[:-2]) & (mid_highs > highs[2:]))
+            self.swing_highs.extend(mid_highs[high_idx[-self.swing_highs.maxlen:]].tolist())
 
-            # Swing low: lower than both neighbors
-            if current.low < prev.low and current.low < next_candle.low:
-                self.swing_lows.append(current.low)
-                if len(self.swing_lows) > 10:
-                    self.swing_lows.pop(0)
+            mid_lows = lows[1:-1]
+            low_idx = np.flatnonzero((mid_lows < lows[:-2]) & (mid_lows < lows[2:]))
+            self.swing_lows.extend(mid_lows[low_idx[-self.swing_lows.maxlen:]].tolist())
 
         # Determine trend
         if len(self.swing_highs) >= 2 and len(self.swing_lows) >= 2:
-            recent_highs = self.swing_highs[-2:]
-            recent_lows = self.swing_lows[-2:]
+            last_high, prev_high = self.swing_highs[-1], self.swing_highs[-2]
+            last_low, prev_low = self.swing_lows[-1], self.swing_lows[-2]
 
             # Higher highs and higher lows = bullish
-            if recent_highs[-1] > recent_highs[-2] and recent_lows[-1] > recent_lows[-2]:
+            if last_high > prev_high and last_low > prev_low:
                 self.trend = "BULLISH"
             # Lower highs and lower lows = bearish
-            elif recent_highs[-1] < recent_highs[-2] and recent_lows[-1] < recent_lows[-2]:
+            elif last_high < prev_high and last_low < prev_low:
                 self.trend = "BEARISH"
             else:
                 self.trend = "NEUTRAL"
 
+    def recent_high(self) -> float:
+        """Highest of the last two swing highs"""
+        return max(islice(reversed(self.swing_highs), 2))
+
+    def recent_low(self) -> float:
+        """Lowest of the last two swing lows"""
+        return min(islice(reversed(self.swing_lows), 2))
+
 
 class ExecutionEngine:
     """
@@ -98,26 +168,53 @@ class ExecutionEngine:
 
     def __init__(self):
         self.structure = MarketStructure()
-        self.kline_history: List[OHLCV] = []
-        self.trade_history: List[Trade] = []
         self.max_history = 50
+        # Fixed-size windows; appends evict the oldest entry in O(1)
+        self.kline_history = KlineBuffer(self.max_history)
+        self.trade_history: Deque[Trade] = deque(maxlen=1000)
+
+        # Rolling orderflow window: (is_buy, quantity) for the last N trades with running volume sums
+        self.orderflow_window = 20
+        self._of_window: Deque[tuple] = deque(maxlen=self.orderflow_window)
+        self._buy_vol = 0.0
+        self._sell_vol = 0.0
+        self._buy_count = 0
 
         self.last_signal: Optional[ExecutionSignal] = None
 
     def add_kline(self, kline: OHLCV):
         """Add kline data"""
         self.kline_history.append(kline)
-        if len(self.kline_history) > self.max_history:
-            self.kline_history.pop(0)
 
         # Update structure
-        self.structure.update(self.kline_history)
+        self.structure.update(self.kline_history.high, self.kline_history.low)
 
     def add_trade(self, trade: Trade):
         """Add trade data for orderflow analysis"""
         self.trade_history.append(trade)
-        if len(self.trade_history) > 1000:
-            self.trade_history.pop(0)
+
+        window = self._of_window
+        if len(window) == window.maxlen:
+            old_is_buy, old_qty = window[0]
+            if old_is_buy:
+                self._buy_vol -= old_qty
+                self._buy_count -= 1
+            else:
+                self._sell_vol -= old_qty
+
+        is_buy = trade.is_buy
+        window.append((is_buy, trade.quantity))
+        if is_buy:
+            self._buy_vol += trade.quantity
+            self._buy_count += 1
+        else:
+            self._sell_vol += trade.quantity
+
+        # Snap to exact zero when a side empties so subtraction drift can't leak into the ratio
+        if self._buy_count == 0:
+            self._buy_vol = 0.0
+        if self._buy_count == len(window):
+            self._sell_vol = 0.0
 
     def _check_liquidity_sweep(
         self,
@@ -128,34 +225,41 @@ class ExecutionEngine:
         if not liquidity_levels or len(self.kline_history) < 3:
             return None
 
-        recent_klines = self.kline_history[-3:]
-
-        for level in liquidity_levels:
-            # Check if we swept above a high
-            if level.level_type.endswith("_HIGH"):
-                # Did we wick above and close below?
-                for kline in recent_klines:
-                    if kline.high > level.price and kline.close < level.price:
-                        return {
-                            "type": "SWEEP_HIGH",
-                            "level": level,
-                            "signal": "SHORT",
-                            "reason": f"Swept {level.level_type} at {level.price:.2f} and returned"
-                        }
-
-            # Check if we swept below a low
-            if level.level_type.endswith("_LOW"):
-                # Did we wick below and close above?
-                for kline in recent_klines:
-                    if kline.low < level.price and kline.close > level.price:
-                        return {
-                            "type": "SWEEP_LOW",
-                            "level": level,
-                            "signal": "LONG",
-                            "reason": f"Swept {level.level_type} at {level.price:.2f} and returned"
-                        }
+        history = self.kline_history
+        highs = history.high[-3:]
+        lows = history.low[-3:]
+        closes = history.close[-3:]
 
-        return None
+        # One (levels x recent klines) pass: did any recent candle wick through a level and close back?
+        n = len(liquidity_levels)
+        prices = np.fromiter((l.price for l in liquidity_levels), dtype=np.float64, count=n)[:, None]
+        is_high = np.fromiter((l.level_type.endswith("_HIGH") for l in liquidity_levels), dtype=bool, count=n)
+        is_low = np.fromiter((l.level_type.endswith("_LOW") for l in liquidity_levels), dtype=bool, count=n)
+
+        swept_high = is_high & ((highs > prices) & (closes < prices)).any(axis=1)
+        swept_low = is_low & ((lows < prices) & (closes > prices)).any(axis=1)
+
+        hits = np.flatnonzero(swept_high | swept_low)
+        if not hits.size:
+            return None
+
+        # First level in input order wins, matching the original scan
+        first = hits[0]
+        level = liquidity_levels[first]
+        if swept_high[first]:
+            return {
+                "type": "SWEEP_HIGH",
+                "level": level,
+                "signal": "SHORT",
+                "reason": f"Swept {level.level_type} at {level.price:.2f} and returned"
+            }
+
+        return {
+            "type": "SWEEP_LOW",
+            "level": level,
+            "signal": "LONG",
+            "reason": f"Swept {level.level_type} at {level.price:.2f} and returned"
+        }
 
     def _check_structure_break(self, current_price: float) -> Optional[Dict[str, Any]]:
         """Check for break of structure or change of character"""
@@ -164,7 +268,7 @@ class ExecutionEngine:
 
         # Break of Structure (BOS) - continuation
         if self.structure.trend == "BULLISH":
-            if current_price > max(self.structure.swing_highs[-2:]):
+            if current_price > self.structure.recent_high():
                 return {
                     "type": "BOS_LONG",
                     "signal": "LONG",
@@ -172,7 +276,7 @@ class ExecutionEngine:
                 }
 
         elif self.structure.trend == "BEARISH":
-            if current_price < min(self.structure.swing_lows[-2:]):
+            if current_price < self.structure.recent_low():
                 return {
                     "type": "BOS_SHORT",
                     "signal": "SHORT",
@@ -181,7 +285,7 @@ class ExecutionEngine:
 
         # Change of Character (CHOCH) - potential reversal
         if self.structure.trend == "BEARISH":
-            if current_price > max(self.structure.swing_highs[-2:]):
+            if current_price > self.structure.recent_high():
                 return {
                     "type": "CHOCH_LONG",
                     "signal": "LONG",
@@ -189,7 +293,7 @@ class ExecutionEngine:
                 }
 
         elif self.structure.trend == "BULLISH":
-            if current_price < min(self.structure.swing_lows[-2:]):
+            if current_price < self.structure.recent_low():
                 return {
                     "type": "CHOCH_SHORT",
                     "signal": "SHORT",
@@ -200,13 +304,11 @@ class ExecutionEngine:
 
     def _analyze_orderflow(self) -> Dict[str, Any]:
         """Analyze recent orderflow for imbalances"""
-        if len(self.trade_history) < 20:
+        if len(self._of_window) < self.orderflow_window:
             return {"imbalance": "NEUTRAL", "ratio": 1.0}
 
-        recent_trades = self.trade_history[-20:]
-
-        buy_volume = sum(t.quantity for t in recent_trades if t.side == "Buy")
-        sell_volume = sum(t.quantity for t in recent_trades if t.side == "Sell")
+        buy_volume = self._buy_vol
+        sell_volume = self._sell_vol
 
         total_volume = buy_volume + sell_volume
         if total_volume == 0:
@@ -249,55 +351,59 @@ class ExecutionEngine:
         )
 
         # Check 1: Regime must permit trading
-        if not regime or not regime.permissions.get("trading_enabled", False):
-            signal.reason = f"Trading disabled by regime: {regime.state if regime else 'Unknown'}"
+        if not regime:
+            signal.reason = "Trading disabled by regime: Unknown"
             return signal
 
-        # Get preferred trade directions
-        preferred_trades = regime.permissions.get("preferred_trades", [])
-
-        # Check 2: Analyze structure
-        structure_signal = self._check_structure_break(current_price)
-
-        # Check 3: Check liquidity sweeps
-        sweep_signal = self._check_liquidity_sweep(current_price, liquidity_levels)
+        # Read regime state and permissions once per call
+        regime_state = regime.state
+        permissions = regime.permissions
+        if not permissions.get("trading_enabled", False):
+            signal.reason = f"Trading disabled by regime: {regime_state}"
+            return signal
 
-        # Check 4: Analyze orderflow
-        orderflow = self._analyze_orderflow()
+        # Get preferred trade directions
+        preferred_trades = permissions.get("preferred_trades", ())
 
         # Build signal
         supporting_factors = []
         confidence = 0.0
 
-        # Determine signal direction
+        # Determine signal direction: liquidity sweep has highest priority,
+        # structure is only evaluated when there is no sweep
         potential_signal = None
 
-        # Liquidity sweep has highest priority
+        # Check 2: Check liquidity sweeps
+        sweep_signal = self._check_liquidity_sweep(current_price, liquidity_levels)
         if sweep_signal:
             potential_signal = sweep_signal["signal"]
             supporting_factors.append(sweep_signal["reason"])
             confidence += 0.4
+        else:
+            # Check 3: Structure confirmation
+            structure_signal = self._check_structure_break(current_price)
+            if structure_signal:
+                potential_signal = structure_signal["signal"]
+                supporting_factors.append(structure_signal["reason"])
+                confidence += 0.3
 
-        # Structure confirmation
-        elif structure_signal:
-            potential_signal = structure_signal["signal"]
-            supporting_factors.append(structure_signal["reason"])
-            confidence += 0.3
+        # Nothing to confirm - skip orderflow and capital flow work entirely
+        if not potential_signal:
+            signal.reason = "Insufficient confidence or no clear setup"
+            return signal
 
         # Check if signal aligns with regime
-        if potential_signal:
-            if potential_signal == "LONG" and "LONG" in preferred_trades:
-                confidence += 0.3
-                supporting_factors.append(f"Aligned with {regime.state} regime")
-            elif potential_signal == "SHORT" and "SHORT" in preferred_trades:
-                confidence += 0.3
-                supporting_factors.append(f"Aligned with {regime.state} regime")
-            else:
-                # Signal against regime preference
-                confidence *= 0.5
-                supporting_factors.append(f"Against {regime.state} regime preference")
+        # potential_signal is "LONG" or "SHORT", so a single membership test covers both directions
+        if potential_signal in preferred_trades:
+            confidence += 0.3
+            supporting_factors.append(f"Aligned with {regime_state} regime")
+        else:
+            # Signal against regime preference
+            confidence *= 0.5
+            supporting_factors.append(f"Against {regime_state} regime preference")
 
-        # Orderflow confirmation
+        # Check 4: Orderflow confirmation
+        orderflow = self._analyze_orderflow()
         if orderflow["imbalance"] == "BULLISH" and potential_signal == "LONG":
             confidence += 0.2
             supporting_factors.append(f"Bullish orderflow (ratio: {orderflow['ratio']:.2f})")
@@ -314,38 +420,32 @@ class ExecutionEngine:
                     supporting_factors.append(f"Capital flow supports {potential_signal}")
 
         # Need minimum confidence to generate signal
-        if confidence < 0.5 or not potential_signal:
+        if confidence < 0.5:
             signal.reason = "Insufficient confidence or no clear setup"
             return signal
 
         # Generate final signal
+        min_above, max_above, min_below, max_below = _bracket_levels(liquidity_levels, current_price)
+
         if potential_signal == "LONG":
             signal.signal_type = SignalType.ENTRY_LONG
-            # Set stop below nearest liquidity
-            if liquidity_levels:
-                below_levels = [l.price for l in liquidity_levels if l.price < current_price]
-                if below_levels:
-                    signal.stop_loss = min(below_levels) - (current_price * 0.001)  # 0.1% below
+            # Set stop below lowest liquidity below price (0.1% buffer)
+            if min_below is not None:
+                signal.stop_loss = min_below - (current_price * 0.001)
 
             # Set target at nearest liquidity above
-            if liquidity_levels:
-                above_levels = [l.price for l in liquidity_levels if l.price > current_price]
-                if above_levels:
-                    signal.take_profit = min(above_levels)
+            if min_above is not None:
+                signal.take_profit = min_above
 
         elif potential_signal == "SHORT":
             signal.signal_type = SignalType.ENTRY_SHORT
-            # Set stop above nearest liquidity
-            if liquidity_levels:
-                above_levels = [l.price for l in liquidity_levels if l.price > current_price]
-                if above_levels:
-                    signal.stop_loss = max(above_levels) + (current_price * 0.001)
+            # Set stop above highest liquidity above price (0.1% buffer)
+            if max_above is not None:
+                signal.stop_loss = max_above + (current_price * 0.001)
 
             # Set target at nearest liquidity below
-            if liquidity_levels:
-                below_levels = [l.price for l in liquidity_levels if l.price < current_price]
-                if below_levels:
-                    signal.take_profit = max(below_levels)
+            if max_below is not None:
+                signal.take_profit = max_below
 
         signal.confidence = min(confidence, 1.0)
         signal.supporting_factors = supporting_factors
@@ -354,8 +454,8 @@ class ExecutionEngine:
         self.last_signal = signal
 
         logger.info(
-            f"Signal Generated: {signal.signal_type.value} @ {signal.price:.2f} | "
-            f"Confidence: {signal.confidence:.2f} | {signal.reason}"
+            "Signal Generated: %s @ %.2f | Confidence: %.2f | %s",
+            signal.signal_type.value, signal.price, signal.confidence, signal.reason
         )
 
         return signal
@@ -0,0 +1,91 @@
+"""
+Numba kernels for the liquidity engine
+Compiled lazily on first call; see src.utils.jit for the no-numba fallback
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+
+# No fastmath: it rewrites price / width as a reciprocal multiply, which moves
+# levels sitting on a band edge and disagrees with the NumPy fallback
+@njit(cache=True)
+def find_bands(prices, qtys, threshold, top_n):
+    """
+    Group order book levels into 0.1% price bands and keep the strongest.
+
+    `prices` are the top-of-book levels to band; `qtys` covers the whole side,
+    so the average size (the imbalance baseline) includes the deeper levels.
+    Band width is 0.1% of the best price. Bands with total / avg >= threshold
+    are ranked by imbalance (ties keep book order) and the top `top_n`
+    are returned as (band_low, band_high, total_size, imbalance) arrays.
+    """
+    n = len(prices)
+    avg = qtys.mean()
+    width = prices[0] * 0.001
+
+    keys = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        keys[i] = np.int64(np.floor(prices[i] / width))
+
+    # Segmented reduction over levels sorted by band key (stable, so book order survives)
+    order = np.argsort(keys, kind="mergesort")
+    band_low = np.empty(n)
+    band_high = np.empty(n)
+    total = np.empty(n)
+    first = np.empty(n, dtype=np.int64)
+
+    n_bands = 0
+    for j in range(n):
+        i = order[j]
+        if n_bands == 0 or keys[i] != keys[order[j - 1]]:
+            band_low[n_bands] = prices[i]
+            band_high[n_bands] = prices[i]
+            total[n_bands] = 0.0
+            first[n_bands] = i
+            n_bands += 1
+        b = n_bands - 1
+        band_low[b] = min(band_low[b], prices[i])
+        band_high[b] = max(band_high[b], prices[i])
+        total[b] += qtys[i]
+
+    ratio = np.zeros(n_bands)
+    if avg > 0:
+        ratio = total[:n_bands] / avg
+
+    # Candidates in book order, then a stable sort by descending imbalance
+    by_book = np.argsort(first[:n_bands], kind="mergesort")
+    keep = by_book[ratio[by_book] >= threshold]
+    ranked = keep[np.argsort(-ratio[keep], kind="mergesort")][:top_n]
+
+    return band_low[ranked], band_high[ranked], total[ranked], ratio[ranked]
+
+
+@njit(cache=True)
+def compute_ofi(bid_prices, bid_qtys, ask_prices, ask_qtys,
+                prev_bid_prices, prev_bid_qtys, prev_ask_prices, prev_ask_qtys, depth):
+    """
+    Multi-level order flow imbalance between two book snapshots.
+
+    Per level i: bid size added at an equal/better bid, minus bid size removed
+    at an equal/worse bid, and the mirror image on the ask side (positive =
+    net buying pressure). The vector is scaled by max(1, max |OFI|).
+    """
+    out = np.zeros(depth)
+    for i in range(depth):
+        e = 0.0
+        if bid_prices[i] >= prev_bid_prices[i]:
+            e += bid_qtys[i]
+        if bid_prices[i] <= prev_bid_prices[i]:
+            e -= prev_bid_qtys[i]
+        if ask_prices[i] <= prev_ask_prices[i]:
+            e -= ask_qtys[i]
+        if ask_prices[i] >= prev_ask_prices[i]:
+            e += prev_ask_qtys[i]
+        out[i] = e
+
+    scale = 1.0
+    for i in range(depth):
+        scale = max(scale, abs(out[i]))
+    return out / scale
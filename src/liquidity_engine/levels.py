@@ -4,6 +4,8 @@ Tracks session levels, prior day levels, and order book liquidity zones
 """
 
 import logging
+import math
+from array import array
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, time, timedelta
 from dataclasses import dataclass
@@ -11,11 +13,17 @@ import numpy as np
 
 from src.models import OHLCV, OrderBook
 from src.config import LIQUIDITY_LEVELS
+from src.utils.jit import NUMBA_AVAILABLE
+from src.utils.kline_buffer import KlineBuffer
+from ._numba_kernels import find_bands, compute_ofi
 
 logger = logging.getLogger(__name__)
 
+# Session order in the session extremes array: [asia_high, asia_low, london_high, ..., ny_low]
+_SESSIONS = ("asia", "london", "ny")
 
-@dataclass
+
+@dataclass(slots=True)
 class LiquidityLevel:
     """A single liquidity level"""
     price: float
@@ -26,7 +34,7 @@ class LiquidityLevel:
     broken: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class LiquidityZone:
     """Order book liquidity zone"""
     price_low: float
@@ -37,6 +45,48 @@ class LiquidityZone:
     timestamp: datetime
 
 
+def _find_bands_numpy(prices: np.ndarray, qtys: np.ndarray, threshold: float, top_n: int):
+    """NumPy equivalent of _numba_kernels.find_bands for environments without numba"""
+    avg = qtys.mean()
+    keys = np.floor(prices / (prices[0] * 0.001)).astype(np.int64)
+
+    # np.unique sorts bands by key; first_idx keeps each band's position in the book
+    _, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    total = np.bincount(inverse, weights=qtys[:len(prices)])
+    band_low = np.full(len(first_idx), np.inf)
+    band_high = np.full(len(first_idx), -np.inf)
+    np.minimum.at(band_low, inverse, prices)
+    np.maximum.at(band_high, inverse, prices)
+
+    ratio = total / avg if avg > 0 else np.zeros(len(total))
+
+    by_book = np.argsort(first_idx, kind="stable")
+    keep = by_book[ratio[by_book] >= threshold]
+    ranked = keep[np.argsort(-ratio[keep], kind="stable")][:top_n]
+
+    return band_low[ranked], band_high[ranked], total[ranked], ratio[ranked]
+
+
+def _compute_ofi_numpy(bid_prices, bid_qtys, ask_prices, ask_qtys,
+                       prev_bid_prices, prev_bid_qtys, prev_ask_prices, prev_ask_qtys, depth):
+    """NumPy equivalent of _numba_kernels.compute_ofi for environments without numba"""
+    bp, bq, ap, aq = bid_prices[:depth], bid_qtys[:depth], ask_prices[:depth], ask_qtys[:depth]
+    pbp, pbq, pap, paq = prev_bid_prices[:depth], prev_bid_qtys[:depth], prev_ask_prices[:depth], prev_ask_qtys[:depth]
+
+    ofi = (
+        np.where(bp >= pbp, bq, 0.0) - np.where(bp <= pbp, pbq, 0.0)
+        - np.where(ap <= pap, aq, 0.0) + np.where(ap >= pap, paq, 0.0)
+    )
+    return ofi / max(1.0, np.abs(ofi).max(initial=0.0))
+
+
+def _book_side_arrays(levels: List) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices and quantities of one book side as float64 arrays"""
+    prices = np.fromiter((level.price for level in levels), dtype=np.float64, count=len(levels))
+    qtys = np.fromiter((level.quantity for level in levels), dtype=np.float64, count=len(levels))
+    return prices, qtys
+
+
 class LiquidityEngine:
     """
     Tracks and manages liquidity levels for trading decisions.
@@ -52,29 +102,40 @@ class LiquidityEngine:
         self.levels: List[LiquidityLevel] = []
         self.zones: List[LiquidityZone] = []
 
-        self.kline_history: List[OHLCV] = []
         self.max_kline_history = 100
+        self.kline_history = KlineBuffer(self.max_kline_history)
 
         self.prior_day_high: Optional[float] = None
         self.prior_day_low: Optional[float] = None
 
-        self.session_levels = {
-            "asia_high": None,
-            "asia_low": None,
-            "london_high": None,
-            "london_low": None,
-            "ny_high": None,
-            "ny_low": None
-        }
+        # Session highs/lows as flat doubles; -inf/+inf mean the session hasn't traded yet
+        self._session_extremes = array("d", [-math.inf, math.inf] * len(_SESSIONS))
 
         self.visible_range_high: Optional[float] = None
         self.visible_range_low: Optional[float] = None
 
+        # Multi-level order flow imbalance vs the previous book snapshot (best level first)
+        self.ofi: Optional[np.ndarray] = None
+        self._prev_book: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+        # UTC hour -> index into _SESSIONS (config says "new_york", levels use "ny").
+        # Where sessions overlap the first configured one wins.
+        self._hour_to_session: List[Optional[int]] = [None] * 24
+        for session_name, hours in LIQUIDITY_LEVELS["session_hours"].items():
+            key = _SESSIONS.index("ny" if session_name == "new_york" else session_name)
+            for hour in range(hours["start"], hours["end"]):
+                if self._hour_to_session[hour] is None:
+                    self._hour_to_session[hour] = key
+
+        # Levels only change on a new kline; the list and its price index are rebuilt lazily after that
+        self._levels_dirty = True
+        self._levels_cache: List[LiquidityLevel] = []
+        self._prices_sorted = np.empty(0, dtype=np.float64)
+        self._levels_sorted: List[LiquidityLevel] = []
+
     def add_kline(self, kline: OHLCV):
         """Add kline data and update levels"""
         self.kline_history.append(kline)
-        if len(self.kline_history) > self.max_kline_history:
-            self.kline_history.pop(0)
 
         # Update session levels
         self._update_session_levels(kline)
@@ -85,37 +146,39 @@ class LiquidityEngine:
         # Update visible range
         self._update_visible_range()
 
-    def _get_current_session(self) -> Optional[str]:
-        """Determine current trading session based on UTC hour"""
-        now = datetime.utcnow()
-        hour = now.hour
-
-        sessions = LIQUIDITY_LEVELS["session_hours"]
-
-        # Check which session we're in
-        for session_name, hours in sessions.items():
-            if hours["start"] <= hour < hours["end"]:
-                return session_name
+        self._levels_dirty = True
+
+    @property
+    def session_levels(self) -> Dict[str, Optional[float]]:
+        """Session highs/lows keyed like "asia_high"; None until the session has traded"""
+        extremes = self._session_extremes
+        levels = {}
+        for i, session in enumerate(_SESSIONS):
+            high, low = extremes[2 * i], extremes[2 * i + 1]
+            levels[f"{session}_high"] = high if high != -math.inf else None
+            levels[f"{session}_low"] = low if low != math.inf else None
+        return levels
 
-        return None
+    def _get_current_session(self) -> Optional[int]:
+        """Determine current trading session (index into _SESSIONS) based on UTC hour"""
+        return self._hour_to_session[datetime.utcnow().hour]
 
     def _update_session_levels(self, kline: OHLCV):
         """Update session high/low levels"""
         session = self._get_current_session()
-        if not session:
+        if session is None:
             return
 
+        extremes = self._session_extremes
+        i = 2 * session
+
         # Update session high
-        high_key = f"{session}_high"
-        if (self.session_levels[high_key] is None or
-                kline.high > self.session_levels[high_key]):
-            self.session_levels[high_key] = kline.high
+        if kline.high > extremes[i]:
+            extremes[i] = kline.high
 
         # Update session low
-        low_key = f"{session}_low"
-        if (self.session_levels[low_key] is None or
-                kline.low < self.session_levels[low_key]):
-            self.session_levels[low_key] = kline.low
+        if kline.low < extremes[i + 1]:
+            extremes[i + 1] = kline.low
 
     def _update_prior_day_levels(self):
         """Update prior day high and low"""
@@ -123,149 +186,145 @@ class LiquidityEngine:
             return
 
         # Get yesterday's data (assuming hourly klines)
-        yesterday_klines = self.kline_history[-48:-24] if len(self.kline_history) >= 48 else []
-
-        if yesterday_klines:
-            self.prior_day_high = max(k.high for k in yesterday_klines)
-            self.prior_day_low = min(k.low for k in yesterday_klines)
+        if len(self.kline_history) >= 48:
+            self.prior_day_high = float(self.kline_history.high[-48:-24].max())
+            self.prior_day_low = float(self.kline_history.low[-48:-24].min())
 
     def _update_visible_range(self):
         """Update visible range high and low"""
         if len(self.kline_history) < 20:
             return
 
-        recent = self.kline_history[-20:]
-        self.visible_range_high = max(k.high for k in recent)
-        self.visible_range_low = min(k.low for k in recent)
+        self.visible_range_high = float(self.kline_history.high[-20:].max())
+        self.visible_range_low = float(self.kline_history.low[-20:].min())
 
     def update_orderbook_zones(self, orderbook: OrderBook):
         """Analyze order book for liquidity imbalance zones"""
         if not orderbook.bids or not orderbook.asks:
             return
 
+        # Extract each side into arrays once for OFI and zone detection
+        bid_prices, bid_qtys = _book_side_arrays(orderbook.bids)
+        ask_prices, ask_qtys = _book_side_arrays(orderbook.asks)
+        book = (bid_prices, bid_qtys, ask_prices, ask_qtys)
+
+        if self._prev_book is not None:
+            depth = min(LIQUIDITY_LEVELS["ofi_levels"], *(len(a) for a in book + self._prev_book))
+            if NUMBA_AVAILABLE:
+                self.ofi = compute_ofi(*book, *self._prev_book, depth)
+            else:
+                self.ofi = _compute_ofi_numpy(*book, *self._prev_book, depth)
+        self._prev_book = book
+
         # Clear old zones
         self.zones = []
 
         # Analyze bid side
-        bid_zones = self._find_imbalance_zones(orderbook.bids, "BID")
+        bid_zones = self._find_imbalance_zones(bid_prices, bid_qtys, "BID")
         self.zones.extend(bid_zones)
 
         # Analyze ask side
-        ask_zones = self._find_imbalance_zones(orderbook.asks, "ASK")
+        ask_zones = self._find_imbalance_zones(ask_prices, ask_qtys, "ASK")
         self.zones.extend(ask_zones)
 
-        logger.debug(f"Found {len(self.zones)} liquidity zones in order book")
+        logger.debug("Found %d liquidity zones in order book", len(self.zones))
 
     def _find_imbalance_zones(
         self,
-        levels: List,
+        prices: np.ndarray,
+        qtys: np.ndarray,
         side: str,
         threshold: float = None
     ) -> List[LiquidityZone]:
-        """Find zones with significant liquidity imbalance"""
+        """Find zones with significant liquidity imbalance on one book side"""
         if threshold is None:
             threshold = LIQUIDITY_LEVELS["imbalance_threshold"]
 
-        zones = []
-
-        if len(levels) < 3:
-            return zones
-
-        # Group levels by price proximity (0.1% bands)
-        price_bands: Dict[float, List] = {}
-
-        for level in levels[:LIQUIDITY_LEVELS["orderbook_depth_levels"]]:
-            band_price = round(level.price / level.price * 0.001) * level.price * 0.001
-            if band_price not in price_bands:
-                price_bands[band_price] = []
-            price_bands[band_price].append(level)
-
-        # Find bands with significant size
-        avg_size = np.mean([level.quantity for level in levels])
-
-        for band_price, band_levels in price_bands.items():
-            total_size = sum(level.quantity for level in band_levels)
-
-            # Check if this band has significant liquidity
-            imbalance_ratio = total_size / avg_size if avg_size > 0 else 0
-
-            if imbalance_ratio >= threshold:
-                prices = [level.price for level in band_levels]
-                zone = LiquidityZone(
-                    price_low=min(prices),
-                    price_high=max(prices),
-                    total_size=total_size,
-                    side=side,
-                    imbalance_ratio=imbalance_ratio,
-                    timestamp=datetime.now()
-                )
-                zones.append(zone)
-
-        # Sort by imbalance ratio
-        zones.sort(key=lambda z: z.imbalance_ratio, reverse=True)
-
-        return zones[:5]  # Top 5 zones per side
-
-    def get_all_levels(self) -> List[LiquidityLevel]:
-        """Get all active liquidity levels"""
-        levels = []
-
+        if len(prices) < 3:
+            return []
+
+        # Band the top of book; the average size still covers every level
+        top = prices[:LIQUIDITY_LEVELS["orderbook_depth_levels"]]
+
+        # Group levels by price proximity (0.1% bands), top 5 zones per side
+        if NUMBA_AVAILABLE:
+            bands = find_bands(top, qtys, threshold, 5)
+        else:
+            bands = _find_bands_numpy(top, qtys, threshold, 5)
+
+        now = datetime.now()
+        return [
+            LiquidityZone(
+                price_low=price_low,
+                price_high=price_high,
+                total_size=total_size,
+                side=side,
+                imbalance_ratio=imbalance_ratio,
+                timestamp=now
+            )
+            for price_low, price_high, total_size, imbalance_ratio in zip(*(b.tolist() for b in bands))
+        ]
+
+    def _iter_levels(self):
+        """Yield (price, level_type, strength) for every active level"""
         # Prior day levels
         if self.prior_day_high:
-            levels.append(LiquidityLevel(
-                price=self.prior_day_high,
-                level_type="PDH",
-                strength=0.9,
-                timestamp=datetime.now()
-            ))
+            yield self.prior_day_high, "PDH", 0.9
 
         if self.prior_day_low:
-            levels.append(LiquidityLevel(
-                price=self.prior_day_low,
-                level_type="PDL",
-                strength=0.9,
-                timestamp=datetime.now()
-            ))
+            yield self.prior_day_low, "PDL", 0.9
 
         # Session levels
-        for session in ["asia", "london", "ny"]:
-            high_key = f"{session}_high"
-            low_key = f"{session}_low"
-
-            if self.session_levels[high_key]:
-                levels.append(LiquidityLevel(
-                    price=self.session_levels[high_key],
-                    level_type=f"{session.upper()}_HIGH",
-                    strength=0.7,
-                    timestamp=datetime.now()
-                ))
-
-            if self.session_levels[low_key]:
-                levels.append(LiquidityLevel(
-                    price=self.session_levels[low_key],
-                    level_type=f"{session.upper()}_LOW",
-                    strength=0.7,
-                    timestamp=datetime.now()
-                ))
+        extremes = self._session_extremes
+        for i, session in enumerate(_SESSIONS):
+            high, low = extremes[2 * i], extremes[2 * i + 1]
+
+            if high and high != -math.inf:
+                yield high, f"{session.upper()}_HIGH", 0.7
+
+            if low and low != math.inf:
+                yield low, f"{session.upper()}_LOW", 0.7
 
         # Visible range
         if self.visible_range_high:
-            levels.append(LiquidityLevel(
-                price=self.visible_range_high,
-                level_type="VR_HIGH",
-                strength=0.6,
-                timestamp=datetime.now()
-            ))
+            yield self.visible_range_high, "VR_HIGH", 0.6
 
         if self.visible_range_low:
-            levels.append(LiquidityLevel(
-                price=self.visible_range_low,
-                level_type="VR_LOW",
-                strength=0.6,
-                timestamp=datetime.now()
-            ))
-
-        return levels
+            yield self.visible_range_low, "VR_LOW", 0.6
+
+    def _refresh_levels(self):
+        """Rebuild the cached level list and its ascending price index"""
+        now = datetime.now()
+        self._levels_cache = [
+            LiquidityLevel(price=price, level_type=level_type, strength=strength, timestamp=now)
+            for price, level_type, strength in self._iter_levels()
+        ]
+
+        # Stable sort keeps get_all_levels order among equal prices
+        prices = np.fromiter(
+            (level.price for level in self._levels_cache), dtype=np.float64, count=len(self._levels_cache)
+        )
+        order = np.argsort(prices, kind="stable")
+        self._prices_sorted = prices[order]
+        self._levels_sorted = [self._levels_cache[i] for i in order]
+
+        self._levels_dirty = False
+
+    def get_all_levels(self, now: Optional[datetime] = None) -> List[LiquidityLevel]:
+        """
+        Get all active liquidity levels
+        Returns the shared list cached since the last kline (treat as read-only);
+        pass `now` to get a fresh list stamped with that time instead.
+        """
+        if now is not None:
+            return [
+                LiquidityLevel(price=price, level_type=level_type, strength=strength, timestamp=now)
+                for price, level_type, strength in self._iter_levels()
+            ]
+
+        if self._levels_dirty:
+            self._refresh_levels()
+        return self._levels_cache
 
     def find_nearest_liquidity(
         self,
@@ -273,17 +332,22 @@ class LiquidityEngine:
         direction: str = "BOTH"
     ) -> Dict[str, Optional[LiquidityLevel]]:
         """Find nearest liquidity levels above and below current price"""
-        levels = self.get_all_levels()
+        if self._levels_dirty:
+            self._refresh_levels()
+        prices = self._prices_sorted
 
-        above = [l for l in levels if l.price > current_price]
-        below = [l for l in levels if l.price < current_price]
+        # First level strictly above
+        above = int(np.searchsorted(prices, current_price, side="right"))
 
-        result = {
-            "above": min(above, key=lambda l: l.price - current_price) if above else None,
-            "below": max(below, key=lambda l: current_price - l.price) if below else None
-        }
+        # Last level strictly below, moved to the first of any equal-priced run
+        below = int(np.searchsorted(prices, current_price, side="left")) - 1
+        if below >= 0:
+            below = int(np.searchsorted(prices, prices[below], side="left"))
 
-        return result
+        return {
+            "above": self._levels_sorted[above] if above < len(prices) else None,
+            "below": self._levels_sorted[below] if below >= 0 else None
+        }
 
     def get_status(self) -> Dict[str, Any]:
         """Get current liquidity engine status"""
@@ -303,6 +367,7 @@ class LiquidityEngine:
                 "low": self.visible_range_low
             },
             "orderbook_zones": len(self.zones),
+            "ofi": self.ofi.tolist() if self.ofi is not None else None,
             "top_zones": [
                 {
                     "side": z.side,
@@ -3,13 +3,21 @@ from .market_data import (
     OrderBook,
     Trade,
     OHLCV,
+    OHLCVBatch,
     FundingRate,
     DXYData,
     BTCDominanceData,
     NewsItem,
 )
 from .regime_data import (
+    DIR_DOWN,
+    DIR_FLAT,
+    DIR_UP,
+    STR_NONE,
+    STR_WEAK,
+    STR_STRONG,
     TrendData,
+    NewsSignals,
     RegimeInput,
     RegimeOutput,
     RegimeTransition,
@@ -20,11 +28,19 @@ __all__ = [
     "OrderBook",
     "Trade",
     "OHLCV",
+    "OHLCVBatch",
     "FundingRate",
     "DXYData",
     "BTCDominanceData",
     "NewsItem",
+    "DIR_DOWN",
+    "DIR_FLAT",
+    "DIR_UP",
+    "STR_NONE",
+    "STR_WEAK",
+    "STR_STRONG",
     "TrendData",
+    "NewsSignals",
     "RegimeInput",
     "RegimeOutput",
     "RegimeTransition",
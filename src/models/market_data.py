@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Literal
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -26,6 +28,11 @@ class Trade(BaseModel):
     # Enforce a strict enum so upstream parsing bugs are caught early.
     side: Literal["buy", "sell"]
 
+    @property
+    def is_buy(self) -> bool:
+        """Side as a bool; derived on access so it always agrees with `side` (copies, assignment)"""
+        return self.side == "buy"
+
 
 class OHLCV(BaseModel):
     symbol: str
@@ -38,6 +45,29 @@ class OHLCV(BaseModel):
     timeframe: str
 
 
+@dataclass(slots=True)
+class OHLCVBatch:
+    """Column-wise (structure-of-arrays) copy of a kline list, oldest first"""
+    timestamp: np.ndarray  # datetime64[ms]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_klines(cls, klines: List[OHLCV]) -> OHLCVBatch:
+        """Gather every field in one pass over the candles; each column is contiguous"""
+        columns = np.array(
+            [(k.open, k.high, k.low, k.close, k.volume) for k in klines], dtype=np.float64
+        ).reshape(-1, 5).T.copy()
+        timestamps = np.array([k.timestamp for k in klines], dtype="datetime64[ms]")
+        return cls(timestamps, *columns)
+
+
 class FundingRate(BaseModel):
     symbol: str
     timestamp: datetime
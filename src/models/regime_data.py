@@ -1,24 +1,55 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, SkipValidation, field_serializer
+from typing import Optional, Dict, Any, Mapping, Tuple
 from datetime import datetime
+from dataclasses import dataclass
 from src.config import RegimeState
 
 
+# Trend direction / strength codes (strength code * 0.5 is the regime score multiplier)
+DIR_DOWN, DIR_FLAT, DIR_UP = -1, 0, 1
+STR_NONE, STR_WEAK, STR_STRONG = 0, 1, 2
+
+_DIRECTION_NAMES = {DIR_DOWN: "DOWN", DIR_FLAT: "FLAT", DIR_UP: "UP"}
+_STRENGTH_NAMES = ("NONE", "WEAK", "STRONG")
+
+
 class TrendData(BaseModel):
     """Trend analysis for an indicator"""
     current_value: float
     slope: float
-    direction: str
-    strength: str
+    direction_code: int
+    strength_code: int
     lookback_periods: int
     timestamp: datetime
 
+    @property
+    def direction(self) -> str:
+        """Direction as "UP", "DOWN" or "FLAT" (for logging and status output)"""
+        return _DIRECTION_NAMES[self.direction_code]
+
+    @property
+    def strength(self) -> str:
+        """Strength as "STRONG", "WEAK" or "NONE" (for logging and status output)"""
+        return _STRENGTH_NAMES[self.strength_code]
+
+
+@dataclass(slots=True, frozen=True)
+class NewsSignals:
+    """Aggregated regime signals from active news"""
+    news_count: int = 0
+    avg_sentiment: float = 0.0
+    risk_signal: str = "NEUTRAL"
+    alignment: str = "NEUTRAL"
+    high_impact_count: int = 0
+    risk_off_count: int = 0
+    risk_on_count: int = 0
+
 
 class RegimeInput(BaseModel):
     """Inputs for regime calculation"""
     dxy_trend: Optional[TrendData] = None
     btc_dominance_trend: Optional[TrendData] = None
-    news_signals: Optional[Dict[str, Any]] = None
+    news_signals: Optional[NewsSignals] = None
     timestamp: datetime
 
 
@@ -29,10 +60,17 @@ class RegimeOutput(BaseModel):
     dxy_contribution: float
     btc_dom_contribution: float
     news_contribution: float
-    permissions: Dict[str, Any]
+    # Shared read-only snapshots from the engine; SkipValidation hands them
+    # through as-is instead of validating them into a new dict/list per update
+    permissions: SkipValidation[Mapping[str, Any]]
     timestamp: datetime
     time_in_state: float
-    state_history: List[str]
+    state_history: SkipValidation[Tuple[str, ...]]
+
+    @field_serializer("permissions")
+    def _serialize_permissions(self, permissions: Mapping[str, Any]) -> Dict[str, Any]:
+        # mappingproxy isn't JSON-serializable; copy only when actually dumping
+        return dict(permissions)
 
 
 class RegimeTransition(BaseModel):
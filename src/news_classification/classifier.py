@@ -1,21 +1,22 @@
+import heapq
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from collections import Counter, deque
 
-from src.models import NewsItem
+from src.models import NewsItem, NewsSignals
 from .keywords import (
     MACRO_KEYWORDS,
     CRYPTO_KEYWORDS,
-    SENTIMENT_KEYWORDS,
-    IMPACT_KEYWORDS,
-    BTC_ALIGNMENT_KEYWORDS
+    KEYWORD_BUCKET_SIZES,
+    count_keyword_matches
 )
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsClassification:
     """Complete classification of a news item"""
     news_item: NewsItem
@@ -31,41 +32,51 @@ class NewsClassification:
 
 class NewsClassifier:
     def __init__(self):
-        self.classified_news: List[NewsClassification] = []
         self.max_history = 100
-
-    def _score_keywords(self, text: str, keywords: List[str]) -> float:
-        """Calculate keyword match score for text"""
-        text_lower = text.lower()
-        matches = sum(1 for keyword in keywords if keyword.lower() in text_lower)
-        return matches / len(keywords) if keywords else 0.0
-
-    def _categorize_news(self, news_item: NewsItem) -> List[str]:
+        # Insertion-ordered; appends past max_history evict the oldest
+        self.classified_news: Deque[NewsClassification] = deque(maxlen=self.max_history)
+        # Earliest expires_at in the history (may be stale-early after an eviction), lets cleanup skip the scan
+        self._next_expiry: Optional[datetime] = None
+
+        # Fixed score thresholds expressed as raw hit counts (score = hits / bucket size)
+        self._impact_high_hits = self._min_hits("IMPACT_HIGH", 0.1)
+        self._impact_medium_hits = self._min_hits("IMPACT_MEDIUM", 0.05)
+        self._btc_specific_hits = self._min_hits("ALIGNMENT_BTC_SPECIFIC", 0.05)
+
+    def _min_hits(self, bucket: str, min_score: float) -> int:
+        """Smallest hit count whose score is strictly above `min_score`"""
+        size = KEYWORD_BUCKET_SIZES[bucket]
+        hits = int(min_score * size)
+        while hits / size <= min_score:
+            hits += 1
+        return hits
+
+    def _score_keywords(self, counts: Counter, bucket: str) -> float:
+        """Calculate keyword match score for a bucket"""
+        size = KEYWORD_BUCKET_SIZES[bucket]
+        return counts[bucket] / size if size else 0.0
+
+    def _categorize_news(self, counts: Counter) -> List[str]:
         """Categorize news into macro and crypto categories"""
-        text = f"{news_item.title} {news_item.description or ''}"
         categories = []
 
         # Check macro categories
-        for category, keywords in MACRO_KEYWORDS.items():
-            score = self._score_keywords(text, keywords)
-            if score > 0:
+        for category in MACRO_KEYWORDS:
+            if counts[f"MACRO_{category}"] > 0:
                 categories.append(f"MACRO_{category}")
 
         # Check crypto categories
-        for category, keywords in CRYPTO_KEYWORDS.items():
-            score = self._score_keywords(text, keywords)
-            if score > 0:
+        for category in CRYPTO_KEYWORDS:
+            if counts[f"CRYPTO_{category}"] > 0:
                 categories.append(f"CRYPTO_{category}")
 
         return categories if categories else ["UNCATEGORIZED"]
 
-    def _analyze_sentiment(self, news_item: NewsItem) -> Tuple[str, float]:
+    def _analyze_sentiment(self, counts: Counter) -> Tuple[str, float]:
         """Analyze sentiment and return sentiment type and score"""
-        text = f"{news_item.title} {news_item.description or ''}"
-
-        positive_score = self._score_keywords(text, SENTIMENT_KEYWORDS["POSITIVE"])
-        negative_score = self._score_keywords(text, SENTIMENT_KEYWORDS["NEGATIVE"])
-        neutral_score = self._score_keywords(text, SENTIMENT_KEYWORDS["NEUTRAL"])
+        positive_score = self._score_keywords(counts, "SENTIMENT_POSITIVE")
+        negative_score = self._score_keywords(counts, "SENTIMENT_NEGATIVE")
+        neutral_score = self._score_keywords(counts, "SENTIMENT_NEUTRAL")
 
         # Determine dominant sentiment
         max_score = max(positive_score, negative_score, neutral_score)
@@ -88,18 +99,14 @@ class NewsClassifier:
 
         return sentiment, score
 
-    def _determine_impact(self, news_item: NewsItem, categories: List[str]) -> str:
+    def _determine_impact(self, counts: Counter, categories: List[str]) -> str:
         """Determine impact level of news"""
-        text = f"{news_item.title} {news_item.description or ''}"
-
         # Check for high impact keywords
-        high_score = self._score_keywords(text, IMPACT_KEYWORDS["HIGH"])
-        if high_score > 0.1:
+        if counts["IMPACT_HIGH"] >= self._impact_high_hits:
             return "HIGH"
 
         # Check for medium impact keywords
-        medium_score = self._score_keywords(text, IMPACT_KEYWORDS["MEDIUM"])
-        if medium_score > 0.05:
+        if counts["IMPACT_MEDIUM"] >= self._impact_medium_hits:
             return "MEDIUM"
 
         # Check category-based impact
@@ -114,20 +121,15 @@ class NewsClassifier:
 
         return "LOW"
 
-    def _detect_alignment(self, news_item: NewsItem, categories: List[str]) -> str:
+    def _detect_alignment(self, counts: Counter, categories: List[str]) -> str:
         """Detect BTC market alignment type"""
-        text = f"{news_item.title} {news_item.description or ''}"
-
-        # Check for explicit alignment keywords
-        aligned_score = self._score_keywords(text, BTC_ALIGNMENT_KEYWORDS["ALIGNED"])
-        decoupled_score = self._score_keywords(text, BTC_ALIGNMENT_KEYWORDS["DECOUPLED"])
-        btc_specific_score = self._score_keywords(text, BTC_ALIGNMENT_KEYWORDS["BTC_SPECIFIC"])
-
         # BTC-specific news suggests decoupling
-        if btc_specific_score > 0.05:
+        if counts["ALIGNMENT_BTC_SPECIFIC"] >= self._btc_specific_hits:
             return "DECOUPLED"
 
-        # Explicit decoupling mentioned
+        # Explicit decoupling mentioned (buckets differ in size, so compare normalized scores)
+        aligned_score = self._score_keywords(counts, "ALIGNMENT_ALIGNED")
+        decoupled_score = self._score_keywords(counts, "ALIGNMENT_DECOUPLED")
         if decoupled_score > aligned_score:
             return "DECOUPLED"
 
@@ -155,32 +157,37 @@ class NewsClassifier:
 
         return min(1.0, macro_score), min(1.0, crypto_score)
 
-    def _calculate_expiry(self, impact_level: str) -> datetime:
+    def _calculate_expiry(self, impact_level: str, now: datetime) -> datetime:
         """Calculate when this news classification expires"""
         from src.config import NEWS_IMPACT_WINDOWS
 
         hours = NEWS_IMPACT_WINDOWS.get(impact_level, 1)
-        return datetime.now() + timedelta(hours=hours)
+        return now + timedelta(hours=hours)
 
     def classify(self, news_item: NewsItem) -> NewsClassification:
         """Classify a news item completely"""
+        now = datetime.now()
+
+        # Match every keyword bucket in one pass
+        counts = count_keyword_matches(f"{news_item.title} {news_item.description or ''}")
+
         # Categorize
-        categories = self._categorize_news(news_item)
+        categories = self._categorize_news(counts)
 
         # Analyze sentiment
-        sentiment, sentiment_score = self._analyze_sentiment(news_item)
+        sentiment, sentiment_score = self._analyze_sentiment(counts)
 
         # Determine impact
-        impact_level = self._determine_impact(news_item, categories)
+        impact_level = self._determine_impact(counts, categories)
 
         # Detect alignment
-        alignment = self._detect_alignment(news_item, categories)
+        alignment = self._detect_alignment(counts, categories)
 
         # Calculate relevance
         macro_relevance, crypto_relevance = self._calculate_relevance(categories)
 
         # Calculate expiry
-        expires_at = self._calculate_expiry(impact_level)
+        expires_at = self._calculate_expiry(impact_level, now)
 
         classification = NewsClassification(
             news_item=news_item,
@@ -199,48 +206,42 @@ class NewsClassifier:
         news_item.impact_level = impact_level
         news_item.category = ", ".join(categories[:3])
 
-        # Store classification
+        # Store classification (expire old entries first so only live ones are evicted at max_history)
+        self._cleanup_old_news(now)
         self.classified_news.append(classification)
-        self._cleanup_old_news()
+        if self._next_expiry is None or expires_at < self._next_expiry:
+            self._next_expiry = expires_at
 
         logger.info(
-            f"Classified: {news_item.title[:50]}... | "
-            f"Sentiment: {sentiment} ({sentiment_score:.2f}) | "
-            f"Impact: {impact_level} | "
-            f"Alignment: {alignment}"
+            "Classified: %.50s... | Sentiment: %s (%.2f) | Impact: %s | Alignment: %s",
+            news_item.title, sentiment, sentiment_score, impact_level, alignment
         )
 
         return classification
 
-    def _cleanup_old_news(self):
+    def _cleanup_old_news(self, now: datetime):
         """Remove expired news classifications"""
-        now = datetime.now()
-        self.classified_news = [
-            nc for nc in self.classified_news
-            if nc.expires_at > now
-        ]
+        if self._next_expiry is None or self._next_expiry > now:
+            return
 
-        # Keep max history
-        if len(self.classified_news) > self.max_history:
-            self.classified_news = self.classified_news[-self.max_history:]
+        self.classified_news = deque(
+            (nc for nc in self.classified_news if nc.expires_at > now),
+            maxlen=self.max_history
+        )
+        self._next_expiry = min((nc.expires_at for nc in self.classified_news), default=None)
 
-    def get_active_news(self) -> List[NewsClassification]:
+    def get_active_news(self, now: Optional[datetime] = None) -> List[NewsClassification]:
         """Get all active (non-expired) news classifications"""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         return [nc for nc in self.classified_news if nc.expires_at > now]
 
-    def get_regime_signals(self) -> Dict[str, any]:
+    def get_regime_signals(self) -> NewsSignals:
         """Extract regime signals from active news"""
         active = self.get_active_news()
 
         if not active:
-            return {
-                "news_count": 0,
-                "avg_sentiment": 0.0,
-                "risk_signal": "NEUTRAL",
-                "alignment": "NEUTRAL",
-                "high_impact_count": 0
-            }
+            return NewsSignals()
 
         # Calculate aggregate sentiment
         avg_sentiment = sum(nc.sentiment_score for nc in active) / len(active)
@@ -277,21 +278,17 @@ class NewsClassifier:
         # Count high impact news
         high_impact_count = sum(1 for nc in active if nc.impact_level == "HIGH")
 
-        return {
-            "news_count": len(active),
-            "avg_sentiment": avg_sentiment,
-            "risk_signal": risk_signal,
-            "alignment": alignment,
-            "high_impact_count": high_impact_count,
-            "risk_off_count": risk_off_count,
-            "risk_on_count": risk_on_count
-        }
+        return NewsSignals(
+            news_count=len(active),
+            avg_sentiment=avg_sentiment,
+            risk_signal=risk_signal,
+            alignment=alignment,
+            high_impact_count=high_impact_count,
+            risk_off_count=risk_off_count,
+            risk_on_count=risk_on_count
+        )
 
     def get_latest_classifications(self, limit: int = 10) -> List[NewsClassification]:
         """Get most recent news classifications"""
-        sorted_news = sorted(
-            self.classified_news,
-            key=lambda nc: nc.news_item.timestamp,
-            reverse=True
-        )
-        return sorted_news[:limit]
+        # Same order as sorted(..., reverse=True)[:limit] without sorting the whole history
+        return heapq.nlargest(limit, self.classified_news, key=lambda nc: nc.news_item.timestamp)
@@ -2,6 +2,24 @@
 Keyword dictionaries for news classification
 """
 
+import re
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+
+import ahocorasick
+
+try:
+    import hyperscan
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    HYPERSCAN_AVAILABLE = False
+
+
+def _lowered(keyword_dict: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+    """Lowercase a keyword dict once at import so matching never re-lowers keywords"""
+    return {category: tuple(k.lower() for k in keywords) for category, keywords in keyword_dict.items()}
+
 # Macro events that affect risk sentiment
 MACRO_KEYWORDS = {
     "RISK_OFF": [
@@ -33,6 +51,7 @@ MACRO_KEYWORDS = {
         "Powell", "Yellen", "Lagarde"
     ]
 }
+_MACRO_LOWER = _lowered(MACRO_KEYWORDS)
 
 # Crypto-specific events
 CRYPTO_KEYWORDS = {
@@ -61,6 +80,7 @@ CRYPTO_KEYWORDS = {
         "yield", "staking", "lending", "TVL", "total value locked"
     ]
 }
+_CRYPTO_LOWER = _lowered(CRYPTO_KEYWORDS)
 
 # Sentiment keywords
 SENTIMENT_KEYWORDS = {
@@ -81,6 +101,7 @@ SENTIMENT_KEYWORDS = {
         "sideways", "range-bound", "consolidate", "await", "watch"
     ]
 }
+_SENTIMENT_LOWER = _lowered(SENTIMENT_KEYWORDS)
 
 # Impact level keywords
 IMPACT_KEYWORDS = {
@@ -103,6 +124,7 @@ IMPACT_KEYWORDS = {
         "might", "suggests", "indicates"
     ]
 }
+_IMPACT_LOWER = _lowered(IMPACT_KEYWORDS)
 
 # Bitcoin-specific alignment keywords
 BTC_ALIGNMENT_KEYWORDS = {
@@ -122,15 +144,101 @@ BTC_ALIGNMENT_KEYWORDS = {
         "BTC dominance", "altcoin", "ordinals", "inscription"
     ]
 }
+_BTC_ALIGNMENT_LOWER = _lowered(BTC_ALIGNMENT_KEYWORDS)
+
+
+_ALL_KEYWORDS = frozenset(
+    keyword
+    for category_dict in (_MACRO_LOWER, _CRYPTO_LOWER, _SENTIMENT_LOWER, _IMPACT_LOWER, _BTC_ALIGNMENT_LOWER)
+    for keywords in category_dict.values()
+    for keyword in keywords
+)
+
+
+def get_all_keywords() -> frozenset:
+    """Flatten all keywords (lowercased) for quick lookup; the set is built once and frozen"""
+    return _ALL_KEYWORDS
+
+
+# Lowercased keyword buckets, named "<GROUP>_<KEY>" (e.g. MACRO_RISK_OFF or SENTIMENT_POSITIVE)
+KEYWORD_GROUPS = {
+    "MACRO": _MACRO_LOWER,
+    "CRYPTO": _CRYPTO_LOWER,
+    "SENTIMENT": _SENTIMENT_LOWER,
+    "IMPACT": _IMPACT_LOWER,
+    "ALIGNMENT": _BTC_ALIGNMENT_LOWER,
+}
+
+
+def _index_buckets() -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, int]]:
+    """
+    Map each keyword to the buckets it belongs to; a keyword listed in several
+    buckets (e.g. "upgrade") counts towards each of them.
+    """
+    bucket_sizes: Dict[str, int] = {}
+    buckets_by_keyword: Dict[str, List[str]] = {}
+    for group, buckets in KEYWORD_GROUPS.items():
+        for name, keywords in buckets.items():
+            bucket = f"{group}_{name}"
+            bucket_sizes[bucket] = len(keywords)
+            for keyword in keywords:
+                buckets_by_keyword.setdefault(keyword, []).append(bucket)
+
+    return {keyword: tuple(buckets) for keyword, buckets in buckets_by_keyword.items()}, bucket_sizes
+
+
+_KEYWORD_BUCKETS, KEYWORD_BUCKET_SIZES = _index_buckets()
+
+
+def _build_matcher() -> ahocorasick.Automaton:
+    """Compile every keyword into one Aho-Corasick automaton; each word maps to (keyword, buckets)"""
+    automaton = ahocorasick.Automaton()
+    for keyword, buckets in _KEYWORD_BUCKETS.items():
+        automaton.add_word(keyword, (keyword, buckets))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_hyperscan_db():
+    """
+    Compile every keyword into one Hyperscan database (pattern id = keyword index).
+    SINGLEMATCH reports each keyword at most once per scan, i.e. distinct matches.
+    """
+    keywords = list(_KEYWORD_BUCKETS)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(keyword).encode() for keyword in keywords],
+        ids=list(range(len(keywords))),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(keywords),
+    )
+    return db, tuple(_KEYWORD_BUCKETS[keyword] for keyword in keywords)
+
+
+_AUTOMATON = _build_matcher()
+# Hyperscan is optional: it scans long article bodies far faster, Aho-Corasick is the fallback
+_HS_DB, _HS_BUCKETS = _build_hyperscan_db() if HYPERSCAN_AVAILABLE else (None, ())
+
+
+def iter_matches(text: str) -> Iterator[Tuple[int, Tuple[str, Tuple[str, ...]]]]:
+    """Yield (end_index, (keyword, buckets)) for every keyword occurrence, case-insensitively"""
+    return _AUTOMATON.iter(text.lower())
+
 
+def _on_hyperscan_match(pattern_id: int, start: int, end: int, flags: int, counts: Counter) -> None:
+    counts.update(_HS_BUCKETS[pattern_id])
 
-def get_all_keywords():
-    """Flatten all keywords for quick lookup"""
-    all_keywords = set()
 
-    for category_dict in [MACRO_KEYWORDS, CRYPTO_KEYWORDS, SENTIMENT_KEYWORDS,
-                          IMPACT_KEYWORDS, BTC_ALIGNMENT_KEYWORDS]:
-        for keyword_list in category_dict.values():
-            all_keywords.update([k.lower() for k in keyword_list])
+def count_keyword_matches(text: str) -> Counter:
+    """Count distinct keyword matches per bucket in a single pass over the text"""
+    counts = Counter()
+    if _HS_DB is not None:
+        # Lowercase in Python (not HS_FLAG_CASELESS) so case folding matches the fallback exactly
+        _HS_DB.scan(text.lower().encode(), match_event_handler=_on_hyperscan_match, context=counts)
+        return counts
 
-    return all_keywords
+    seen = set()
+    for _, (keyword, buckets) in iter_matches(text):
+        if keyword not in seen:
+            seen.add(keyword)
+            counts.update(buckets)
+    return counts
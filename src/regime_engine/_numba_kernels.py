@@ -0,0 +1,35 @@
+"""
+Numba kernels for the regime engine
+Compiled lazily on first call; see src.utils.jit for the no-numba fallback
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+
+# No fastmath: reassociating the weighted sum could flip argmax ties against the NumPy fallback
+@njit(cache=True)
+def score_regimes(dxy, btc_dom, news, w_dxy, w_btc_dom, w_news):
+    """
+    Weighted sum of the per-input score vectors, normalized to sum to 1
+    (when positive). Missing inputs are passed as zero vectors.
+    Returns (best index, best score, scores); ties resolve to the lower index.
+    """
+    n = len(dxy)
+    scores = np.empty(n)
+    total = 0.0
+    for i in range(n):
+        scores[i] = dxy[i] * w_dxy + btc_dom[i] * w_btc_dom + news[i] * w_news
+        total += scores[i]
+
+    if total > 0:
+        for i in range(n):
+            scores[i] /= total
+
+    best = 0
+    for i in range(1, n):
+        if scores[i] > scores[best]:
+            best = i
+
+    return best, scores[best], scores
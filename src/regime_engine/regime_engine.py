@@ -1,14 +1,41 @@
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from collections import deque
+from itertools import islice
+import numpy as np
 
 from src.config import RegimeState, REGIME_PERMISSIONS
-from src.models import RegimeInput, RegimeOutput, RegimeTransition, TrendData
+from src.models import NewsSignals, RegimeInput, RegimeOutput, RegimeTransition, TrendData
+from src.utils.jit import NUMBA_AVAILABLE
 from .trend_analyzer import TrendAnalyzer
+from ._numba_kernels import score_regimes
 
 logger = logging.getLogger(__name__)
 
+# Fixed state order for score vectors (argmax ties resolve to the earlier state)
+STATES = (RegimeState.RISK_ON, RegimeState.RISK_OFF, RegimeState.DECOUPLED, RegimeState.CHOP)
+STATE_IDX = {state: i for i, state in enumerate(STATES)}
+_RISK_ON, _RISK_OFF, _DECOUPLED, _CHOP = (STATE_IDX[state] for state in STATES)
+
+# Input weights in the regime score
+_W_DXY = 0.4
+_W_BTC_DOM = 0.3
+_W_NEWS = 0.3
+
+_NO_SIGNAL = np.zeros(len(STATES))
+_NO_SIGNAL.setflags(write=False)
+
+
+def _score_regimes_numpy(dxy, btc_dom, news, w_dxy, w_btc_dom, w_news):
+    """NumPy equivalent of _numba_kernels.score_regimes for environments without numba"""
+    scores = dxy * w_dxy + btc_dom * w_btc_dom + news * w_news
+    total = scores.sum()
+    if total > 0:
+        scores /= total
+    best = int(scores.argmax())
+    return best, scores[best], scores
+
 
 class RegimeEngine:
     """
@@ -25,157 +52,154 @@ class RegimeEngine:
 
         self.current_state = RegimeState.CHOP
         self.state_entered_at = datetime.now()
-        self.last_update = datetime.now()
+        self.last_update = self.state_entered_at
 
         self.min_time_in_state = min_time_in_state
         self.confidence_threshold = 0.6
 
         self.state_history: deque = deque(maxlen=50)
-        self.transition_history: List[RegimeTransition] = []
+        # Snapshot handed to every RegimeOutput, rebuilt only when the history contents change
+        self._state_history_snapshot: Tuple[str, ...] = ()
+        self._state_run = 0  # Trailing entries equal to the current state
+        self.max_transition_history = 200
+        self.transition_history: deque = deque(maxlen=self.max_transition_history)
+
+        # Scoring is a pure function of the score key, so repeated inputs reuse the last result
+        self._score_key: Optional[tuple] = None
+        self._score_result: Optional[tuple] = None
 
         logger.info(f"Regime Engine initialized. Initial state: {self.current_state}")
 
-    def _calculate_regime_scores(self, regime_input: RegimeInput) -> Dict[RegimeState, float]:
-        """Calculate scores for each possible regime state"""
-        scores = {
-            RegimeState.RISK_ON: 0.0,
-            RegimeState.RISK_OFF: 0.0,
-            RegimeState.DECOUPLED: 0.0,
-            RegimeState.CHOP: 0.0
-        }
+    def _calculate_regime_scores(
+        self,
+        regime_input: RegimeInput
+    ) -> Tuple[int, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate normalized scores for each possible regime state, indexed like STATES
+        Returns (best index, confidence, scores) plus the DXY, BTC.D and news
+        contributions (zero vectors when that input is missing)
+        Returns the previous result unchanged when the score key has not changed
+        """
+        if not (regime_input.dxy_trend or regime_input.btc_dominance_trend or regime_input.news_signals):
+            # Nothing to score (cold start / data gap): hold the current state at zero confidence
+            return STATE_IDX[self.current_state], 0.0, _NO_SIGNAL, _NO_SIGNAL, _NO_SIGNAL, _NO_SIGNAL
 
-        weights = {
-            "dxy": 0.4,
-            "btc_dom": 0.3,
-            "news": 0.3
-        }
+        key = self._get_score_key(regime_input)
+        if key == self._score_key:
+            return self._score_result
+
+        dxy_signal = btc_dom_signal = news_signal = _NO_SIGNAL
 
-        # DXY contribution
         if regime_input.dxy_trend:
             dxy_signal = self._get_dxy_contribution(regime_input.dxy_trend)
-            for state, value in dxy_signal.items():
-                scores[state] += value * weights["dxy"]
 
-        # BTC Dominance contribution
         if regime_input.btc_dominance_trend:
             btc_dom_signal = self._get_btc_dom_contribution(regime_input.btc_dominance_trend)
-            for state, value in btc_dom_signal.items():
-                scores[state] += value * weights["btc_dom"]
 
-        # News contribution
         if regime_input.news_signals:
             news_signal = self._get_news_contribution(regime_input.news_signals)
-            for state, value in news_signal.items():
-                scores[state] += value * weights["news"]
-
-        # Normalize scores
-        total = sum(scores.values())
-        if total > 0:
-            scores = {k: v / total for k, v in scores.items()}
-
-        return scores
-
-    def _get_dxy_contribution(self, dxy_trend: TrendData) -> Dict[RegimeState, float]:
-        """Calculate DXY contribution to regime scores"""
-        contribution = {
-            RegimeState.RISK_ON: 0.0,
-            RegimeState.RISK_OFF: 0.0,
-            RegimeState.DECOUPLED: 0.0,
-            RegimeState.CHOP: 0.0
-        }
 
-        strength_multiplier = {
-            "STRONG": 1.0,
-            "WEAK": 0.5,
-            "NONE": 0.0
-        }
+        score = score_regimes if NUMBA_AVAILABLE else _score_regimes_numpy
+        best, confidence, scores = score(
+            dxy_signal, btc_dom_signal, news_signal, _W_DXY, _W_BTC_DOM, _W_NEWS
+        )
+
+        self._score_key = key
+        self._score_result = (int(best), float(confidence), scores, dxy_signal, btc_dom_signal, news_signal)
+        return self._score_result
+
+    @staticmethod
+    def _get_score_key(regime_input: RegimeInput) -> tuple:
+        """Every input field the regime scores depend on"""
+        dxy = regime_input.dxy_trend
+        btc_dom = regime_input.btc_dominance_trend
+        news = regime_input.news_signals
+
+        return (
+            (dxy.direction_code, dxy.strength_code) if dxy else None,
+            (btc_dom.direction_code, btc_dom.strength_code) if btc_dom else None,
+            (
+                news.news_count,
+                news.risk_signal,
+                news.alignment,
+                news.high_impact_count,
+            ) if news else None,
+        )
+
+    def _get_dxy_contribution(self, dxy_trend: TrendData) -> np.ndarray:
+        """Calculate DXY contribution to regime scores (indexed like STATES)"""
+        contribution = np.zeros(len(STATES))
 
-        multiplier = strength_multiplier.get(dxy_trend.strength, 0.0)
+        multiplier = 0.5 * dxy_trend.strength_code
 
-        if dxy_trend.direction == "UP":
+        if dxy_trend.direction_code > 0:
             # DXY rising = USD strength = RISK_OFF
-            contribution[RegimeState.RISK_OFF] = 1.0 * multiplier
-        elif dxy_trend.direction == "DOWN":
+            contribution[_RISK_OFF] = 1.0 * multiplier
+        elif dxy_trend.direction_code < 0:
             # DXY falling = USD weakness = RISK_ON
-            contribution[RegimeState.RISK_ON] = 1.0 * multiplier
+            contribution[_RISK_ON] = 1.0 * multiplier
         else:
             # Flat DXY = CHOP
-            contribution[RegimeState.CHOP] = 0.5
+            contribution[_CHOP] = 0.5
 
         return contribution
 
-    def _get_btc_dom_contribution(self, btc_dom_trend: TrendData) -> Dict[RegimeState, float]:
-        """Calculate BTC dominance contribution to regime scores"""
-        contribution = {
-            RegimeState.RISK_ON: 0.0,
-            RegimeState.RISK_OFF: 0.0,
-            RegimeState.DECOUPLED: 0.0,
-            RegimeState.CHOP: 0.0
-        }
-
-        strength_multiplier = {
-            "STRONG": 1.0,
-            "WEAK": 0.5,
-            "NONE": 0.0
-        }
+    def _get_btc_dom_contribution(self, btc_dom_trend: TrendData) -> np.ndarray:
+        """Calculate BTC dominance contribution to regime scores (indexed like STATES)"""
+        contribution = np.zeros(len(STATES))
 
-        multiplier = strength_multiplier.get(btc_dom_trend.strength, 0.0)
+        multiplier = 0.5 * btc_dom_trend.strength_code
 
-        if btc_dom_trend.direction == "UP":
+        if btc_dom_trend.direction_code > 0:
             # BTC.D rising = BTC outperforming = possible DECOUPLED or RISK_OFF
-            contribution[RegimeState.DECOUPLED] = 0.6 * multiplier
-            contribution[RegimeState.RISK_OFF] = 0.4 * multiplier
-        elif btc_dom_trend.direction == "DOWN":
+            contribution[_DECOUPLED] = 0.6 * multiplier
+            contribution[_RISK_OFF] = 0.4 * multiplier
+        elif btc_dom_trend.direction_code < 0:
             # BTC.D falling = Alts outperforming = RISK_ON in crypto
-            contribution[RegimeState.RISK_ON] = 0.7 * multiplier
-            contribution[RegimeState.DECOUPLED] = 0.3 * multiplier
+            contribution[_RISK_ON] = 0.7 * multiplier
+            contribution[_DECOUPLED] = 0.3 * multiplier
         else:
-            contribution[RegimeState.CHOP] = 0.5
+            contribution[_CHOP] = 0.5
 
         return contribution
 
-    def _get_news_contribution(self, news_signals: Dict[str, Any]) -> Dict[RegimeState, float]:
-        """Calculate news contribution to regime scores"""
-        contribution = {
-            RegimeState.RISK_ON: 0.0,
-            RegimeState.RISK_OFF: 0.0,
-            RegimeState.DECOUPLED: 0.0,
-            RegimeState.CHOP: 0.0
-        }
+    def _get_news_contribution(self, news_signals: NewsSignals) -> np.ndarray:
+        """Calculate news contribution to regime scores (indexed like STATES)"""
+        contribution = np.zeros(len(STATES))
 
-        if not news_signals or news_signals.get("news_count", 0) == 0:
-            contribution[RegimeState.CHOP] = 0.3
+        if not news_signals or news_signals.news_count == 0:
+            contribution[_CHOP] = 0.3
             return contribution
 
-        risk_signal = news_signals.get("risk_signal", "NEUTRAL")
-        alignment = news_signals.get("alignment", "NEUTRAL")
-        high_impact_count = news_signals.get("high_impact_count", 0)
+        risk_signal = news_signals.risk_signal
+        alignment = news_signals.alignment
+        high_impact_count = news_signals.high_impact_count
 
         # Risk signal contribution
         if risk_signal == "RISK_OFF":
-            contribution[RegimeState.RISK_OFF] = 0.8
+            contribution[_RISK_OFF] = 0.8
         elif risk_signal == "RISK_ON":
-            contribution[RegimeState.RISK_ON] = 0.8
+            contribution[_RISK_ON] = 0.8
         else:
-            contribution[RegimeState.CHOP] = 0.3
+            contribution[_CHOP] = 0.3
 
         # Alignment contribution
         if alignment == "DECOUPLED":
-            contribution[RegimeState.DECOUPLED] += 0.5
+            contribution[_DECOUPLED] += 0.5
         elif alignment == "ALIGNED":
             # Strengthen the risk signal
             if risk_signal == "RISK_OFF":
-                contribution[RegimeState.RISK_OFF] += 0.2
+                contribution[_RISK_OFF] += 0.2
             elif risk_signal == "RISK_ON":
-                contribution[RegimeState.RISK_ON] += 0.2
+                contribution[_RISK_ON] += 0.2
 
         # High impact news reduces CHOP
         if high_impact_count > 0:
-            contribution[RegimeState.CHOP] *= 0.5
+            contribution[_CHOP] *= 0.5
 
         return contribution
 
-    def _should_transition(self, new_state: RegimeState, confidence: float) -> bool:
+    def _should_transition(self, new_state: RegimeState, confidence: float, now: datetime) -> bool:
         """Determine if state transition should occur"""
         # Same state, no transition needed
         if new_state == self.current_state:
@@ -189,7 +213,7 @@ class RegimeEngine:
             return False
 
         # Check minimum time in current state
-        time_in_state = (datetime.now() - self.state_entered_at).total_seconds()
+        time_in_state = (now - self.state_entered_at).total_seconds()
         if time_in_state < self.min_time_in_state:
             logger.debug(
                 f"Time in state {time_in_state}s below minimum {self.min_time_in_state}s"
@@ -200,32 +224,22 @@ class RegimeEngine:
 
     def update(self, regime_input: RegimeInput) -> RegimeOutput:
         """Update regime state based on new inputs"""
+        now = datetime.now()
+
         # Calculate scores for all states
-        scores = self._calculate_regime_scores(regime_input)
+        best, confidence, scores, dxy_signal, btc_dom_signal, news_signal = \
+            self._calculate_regime_scores(regime_input)
 
         # Determine new state (highest score)
-        new_state = max(scores, key=scores.get)
-        confidence = scores[new_state]
+        new_state = STATES[best]
 
         # Individual contributions for output
-        dxy_contrib = 0.0
-        btc_dom_contrib = 0.0
-        news_contrib = 0.0
-
-        if regime_input.dxy_trend:
-            dxy_signal = self._get_dxy_contribution(regime_input.dxy_trend)
-            dxy_contrib = dxy_signal.get(new_state, 0.0)
-
-        if regime_input.btc_dominance_trend:
-            btc_dom_signal = self._get_btc_dom_contribution(regime_input.btc_dominance_trend)
-            btc_dom_contrib = btc_dom_signal.get(new_state, 0.0)
-
-        if regime_input.news_signals:
-            news_signal = self._get_news_contribution(regime_input.news_signals)
-            news_contrib = news_signal.get(new_state, 0.0)
+        dxy_contrib = float(dxy_signal[best])
+        btc_dom_contrib = float(btc_dom_signal[best])
+        news_contrib = float(news_signal[best])
 
         # Check if transition should occur
-        if self._should_transition(new_state, confidence):
+        if self._should_transition(new_state, confidence, now):
             reason = self._build_transition_reason(scores, regime_input)
 
             transition = RegimeTransition(
@@ -233,12 +247,12 @@ class RegimeEngine:
                 to_state=new_state,
                 reason=reason,
                 confidence=confidence,
-                timestamp=datetime.now()
+                timestamp=now
             )
 
             self.transition_history.append(transition)
             self.current_state = new_state
-            self.state_entered_at = datetime.now()
+            self.state_entered_at = now
 
             logger.info(
                 f"Regime transition: {transition.from_state} -> {transition.to_state} "
@@ -246,10 +260,19 @@ class RegimeEngine:
             )
 
         # Update state history
-        self.state_history.append(self.current_state.value)
+        state_value = self.current_state.value
+        if self.state_history and self.state_history[-1] == state_value:
+            self._state_run += 1
+        else:
+            self._state_run = 1
+        self.state_history.append(state_value)
+
+        # Appending to a full deque that holds only this state leaves it unchanged
+        if self._state_run <= self.state_history.maxlen:
+            self._state_history_snapshot = tuple(self.state_history)
 
         # Calculate time in current state
-        time_in_state = (datetime.now() - self.state_entered_at).total_seconds()
+        time_in_state = self.get_time_in_state(now)
 
         # Get permissions for current state
         permissions = REGIME_PERMISSIONS.get(self.current_state, {})
@@ -262,16 +285,16 @@ class RegimeEngine:
             btc_dom_contribution=btc_dom_contrib,
             news_contribution=news_contrib,
             permissions=permissions,
-            timestamp=datetime.now(),
+            timestamp=now,
             time_in_state=time_in_state,
-            state_history=list(self.state_history)
+            state_history=self._state_history_snapshot
         )
 
-        self.last_update = datetime.now()
+        self.last_update = now
 
         return output
 
-    def _build_transition_reason(self, scores: Dict[RegimeState, float],
+    def _build_transition_reason(self, scores: np.ndarray,
                                  regime_input: RegimeInput) -> str:
         """Build human-readable transition reason"""
         reasons = []
@@ -289,7 +312,7 @@ class RegimeEngine:
             )
 
         if regime_input.news_signals:
-            risk_signal = regime_input.news_signals.get("risk_signal", "NEUTRAL")
+            risk_signal = regime_input.news_signals.risk_signal
             if risk_signal != "NEUTRAL":
                 reasons.append(f"News: {risk_signal}")
 
@@ -298,34 +321,48 @@ class RegimeEngine:
     def force_state(self, state: RegimeState, reason: str = "Manual override"):
         """Force regime to a specific state (for testing or manual control)"""
         if state != self.current_state:
+            now = datetime.now()
             transition = RegimeTransition(
                 from_state=self.current_state,
                 to_state=state,
                 reason=reason,
                 confidence=1.0,
-                timestamp=datetime.now()
+                timestamp=now
             )
 
             self.transition_history.append(transition)
             self.current_state = state
-            self.state_entered_at = datetime.now()
+            self.state_entered_at = now
 
             logger.warning(f"Forced regime transition: {transition.from_state} -> {state}")
 
-    def get_status(self) -> Dict[str, Any]:
-        """Get current regime engine status"""
-        time_in_state = (datetime.now() - self.state_entered_at).total_seconds()
+    def get_time_in_state(self, now: Optional[datetime] = None) -> float:
+        """Seconds spent in the current state"""
+        if now is None:
+            now = datetime.now()
+        return (now - self.state_entered_at).total_seconds()
 
-        recent_transitions = self.transition_history[-5:]
+    def get_status(self, include_history: bool = True) -> Dict[str, Any]:
+        """
+        Get current regime engine status
+        include_history=False skips building the recent transitions and state history
+        """
+        time_in_state = self.get_time_in_state()
 
-        return {
+        status = {
             "current_state": self.current_state.value,
             "time_in_state_seconds": time_in_state,
             "time_in_state_formatted": str(timedelta(seconds=int(time_in_state))),
             "last_update": self.last_update.isoformat(),
             "state_entered_at": self.state_entered_at.isoformat(),
-            "permissions": REGIME_PERMISSIONS.get(self.current_state, {}),
-            "recent_transitions": [
+            "permissions": dict(REGIME_PERMISSIONS.get(self.current_state, {})),
+        }
+
+        if include_history:
+            # Last 5, oldest first, without walking the whole deque
+            recent_transitions = list(islice(reversed(self.transition_history), 5))[::-1]
+
+            status["recent_transitions"] = [
                 {
                     "from": t.from_state.value,
                     "to": t.to_state.value,
@@ -334,6 +371,7 @@ class RegimeEngine:
                     "timestamp": t.timestamp.isoformat()
                 }
                 for t in recent_transitions
-            ],
-            "state_history": list(self.state_history)
-        }
+            ]
+            status["state_history"] = list(self.state_history)
+
+        return status
@@ -1,10 +1,14 @@
 import logging
-from typing import List, Optional
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 from datetime import datetime
 import numpy as np
 
-from src.models import DXYData, BTCDominanceData, TrendData
+from src.models import (
+    DXYData, BTCDominanceData, TrendData,
+    DIR_DOWN, DIR_FLAT, DIR_UP, STR_NONE, STR_WEAK, STR_STRONG
+)
 from src.config import DXY_THRESHOLDS, BTC_DOMINANCE_THRESHOLDS
+from src.utils.ring_buffer import RingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -13,23 +17,31 @@ class TrendAnalyzer:
     """Analyzes trends for macro indicators"""
 
     def __init__(self):
-        self.dxy_history: List[DXYData] = []
-        self.btc_dom_history: List[BTCDominanceData] = []
         self.max_history = 100
+        # Only the values feed the trend math, so keep them in preallocated ring buffers
+        self.dxy_history = RingBuffer(self.max_history)
+        self.btc_dom_history = RingBuffer(self.max_history)
+
+        # Centered x (0..n-1 minus its mean) and sum of its squares, per window length
+        self._slope_x: Dict[int, Tuple[np.ndarray, float]] = {}
 
     def add_dxy_data(self, data: DXYData):
         """Add DXY data point"""
-        self.dxy_history.append(data)
-        if len(self.dxy_history) > self.max_history:
-            self.dxy_history.pop(0)
+        self.dxy_history.append(data.value)
 
     def add_btc_dominance_data(self, data: BTCDominanceData):
         """Add BTC dominance data point"""
-        self.btc_dom_history.append(data)
-        if len(self.btc_dom_history) > self.max_history:
-            self.btc_dom_history.pop(0)
+        self.btc_dom_history.append(data.value)
+
+    def add_dxy_data_batch(self, points: Iterable[DXYData]):
+        """Add many DXY data points (oldest first), e.g. when backfilling history"""
+        self.dxy_history.extend(np.fromiter((p.value for p in points), dtype=np.float64))
+
+    def add_btc_dominance_data_batch(self, points: Iterable[BTCDominanceData]):
+        """Add many BTC dominance data points (oldest first), e.g. when backfilling history"""
+        self.btc_dom_history.extend(np.fromiter((p.value for p in points), dtype=np.float64))
 
-    def _calculate_slope(self, values: List[float], periods: int) -> float:
+    def _calculate_slope(self, values: np.ndarray, periods: int) -> float:
         """Calculate linear regression slope"""
         if len(values) < 2:
             return 0.0
@@ -38,40 +50,107 @@ class TrendAnalyzer:
         if len(recent) < 2:
             return 0.0
 
-        x = np.arange(len(recent))
-        y = np.array(recent)
+        n = len(recent)
+        y = np.asarray(recent, dtype=np.float64)
+
+        cached = self._slope_x.get(n)
+        if cached is None:
+            x = np.arange(n, dtype=np.float64) - (n - 1) / 2
+            cached = self._slope_x[n] = (x, float(x @ x))
+        x, sxx = cached
+
+        # Closed-form least-squares slope (same fit as np.polyfit(x, y, 1))
+        slope = float(x @ y) / sxx
+
+        # Normalize slope relative to mean value
+        mean_val = float(y.sum()) / n
+        if mean_val != 0:
+            slope = (slope / mean_val) * 100
+        return slope
+
+    def _calculate_slopes(self, values: np.ndarray, lookbacks: Sequence[int]) -> np.ndarray:
+        """
+        Normalized slopes (as in _calculate_slope) for several trailing windows in one pass
+        Prefix sums of y and i*y give each window's regression sums in O(1)
+        """
+        n = len(values)
+        # Slopes don't depend on an offset; removing the level keeps the prefix sums precise
+        offset = float(values[-1]) if n else 0.0
+        y = np.asarray(values, dtype=np.float64) - offset
+        cy = np.concatenate(([0.0], np.cumsum(y)))
+        ciy = np.concatenate(([0.0], np.cumsum(np.arange(n) * y)))
+
+        windows = np.minimum(np.asarray(lookbacks, dtype=np.int64), n)
+        slopes = np.zeros(len(windows))
+        valid = windows >= 2
+        if not valid.any():
+            return slopes
+
+        length = windows[valid].astype(np.float64)
+        start = n - windows[valid]
+        sy = cy[n] - cy[start]
+        # Sum of (i - start) * y_i, i.e. x = 0..length-1 within the window
+        sxy = ciy[n] - ciy[start] - start * sy
+
+        slope = (sxy - (length - 1) / 2 * sy) / (length * (length * length - 1) / 12)
+
+        # Normalize slope relative to mean value
+        mean_val = sy / length + offset
+        nonzero = mean_val != 0
+        slope[nonzero] = slope[nonzero] / mean_val[nonzero] * 100
+
+        slopes[valid] = slope
+        return slopes
+
+    def _analyze_trends(
+        self,
+        history: RingBuffer,
+        lookbacks: Sequence[int],
+        direction_threshold: float,
+        weak_threshold: float,
+        strong_threshold: float
+    ) -> Dict[int, TrendData]:
+        """Build a TrendData per lookback from a single prefix-sum pass over `history`"""
+        if not history:
+            return {}
+
+        values = history.values
+        current_value = float(values[-1])
+        now = datetime.now()
+        slopes = self._calculate_slopes(values, lookbacks)
 
-        # Linear regression
-        if len(x) > 1:
-            slope = np.polyfit(x, y, 1)[0]
-            # Normalize slope relative to mean value
-            mean_val = np.mean(y)
-            if mean_val != 0:
-                slope = (slope / mean_val) * 100
-            return float(slope)
-
-        return 0.0
+        return {
+            lookback: TrendData(
+                current_value=current_value,
+                slope=float(slope),
+                direction_code=self._determine_direction(slope, direction_threshold),
+                strength_code=self._determine_strength(slope, weak_threshold, strong_threshold),
+                lookback_periods=min(lookback, len(history)),
+                timestamp=now
+            )
+            for lookback, slope in zip(lookbacks, slopes)
+        }
 
-    def _determine_direction(self, slope: float, threshold: float) -> str:
-        """Determine trend direction based on slope"""
+    def _determine_direction(self, slope: float, threshold: float) -> int:
+        """Determine trend direction code (DIR_UP / DIR_DOWN / DIR_FLAT) based on slope"""
         if slope > threshold:
-            return "UP"
+            return DIR_UP
         elif slope < -threshold:
-            return "DOWN"
+            return DIR_DOWN
         else:
-            return "FLAT"
+            return DIR_FLAT
 
     def _determine_strength(self, slope: float, weak_threshold: float,
-                           strong_threshold: float) -> str:
-        """Determine trend strength"""
+                           strong_threshold: float) -> int:
+        """Determine trend strength code (STR_STRONG / STR_WEAK / STR_NONE)"""
         abs_slope = abs(slope)
 
         if abs_slope >= strong_threshold:
-            return "STRONG"
+            return STR_STRONG
         elif abs_slope >= weak_threshold:
-            return "WEAK"
+            return STR_WEAK
         else:
-            return "NONE"
+            return STR_NONE
 
     def analyze_dxy_trend(self, lookback: Optional[int] = None) -> Optional[TrendData]:
         """Analyze DXY trend"""
@@ -80,7 +159,7 @@ class TrendAnalyzer:
 
         lookback = lookback or DXY_THRESHOLDS["lookback_periods"]
 
-        values = [d.value for d in self.dxy_history]
+        values = self.dxy_history.values
         slope = self._calculate_slope(values, lookback)
 
         direction = self._determine_direction(
@@ -95,10 +174,10 @@ class TrendAnalyzer:
         )
 
         return TrendData(
-            current_value=self.dxy_history[-1].value,
+            current_value=float(values[-1]),
             slope=slope,
-            direction=direction,
-            strength=strength,
+            direction_code=direction,
+            strength_code=strength,
             lookback_periods=min(lookback, len(self.dxy_history)),
             timestamp=datetime.now()
         )
@@ -110,7 +189,7 @@ class TrendAnalyzer:
 
         lookback = lookback or BTC_DOMINANCE_THRESHOLDS["lookback_periods"]
 
-        values = [d.value for d in self.btc_dom_history]
+        values = self.btc_dom_history.values
         slope = self._calculate_slope(values, lookback)
 
         direction = self._determine_direction(
@@ -125,14 +204,34 @@ class TrendAnalyzer:
         )
 
         return TrendData(
-            current_value=self.btc_dom_history[-1].value,
+            current_value=float(values[-1]),
             slope=slope,
-            direction=direction,
-            strength=strength,
+            direction_code=direction,
+            strength_code=strength,
             lookback_periods=min(lookback, len(self.btc_dom_history)),
             timestamp=datetime.now()
         )
 
+    def analyze_dxy_trends(self, lookbacks: Sequence[int]) -> Dict[int, TrendData]:
+        """Analyze DXY trends over several lookbacks at once, keyed by lookback"""
+        return self._analyze_trends(
+            self.dxy_history,
+            lookbacks,
+            DXY_THRESHOLDS["weak_trend_slope"],
+            DXY_THRESHOLDS["weak_trend_slope"],
+            DXY_THRESHOLDS["strong_trend_slope"]
+        )
+
+    def analyze_btc_dominance_trends(self, lookbacks: Sequence[int]) -> Dict[int, TrendData]:
+        """Analyze BTC dominance trends over several lookbacks at once, keyed by lookback"""
+        return self._analyze_trends(
+            self.btc_dom_history,
+            lookbacks,
+            abs(BTC_DOMINANCE_THRESHOLDS["falling_threshold"]),
+            abs(BTC_DOMINANCE_THRESHOLDS["falling_threshold"]),
+            abs(BTC_DOMINANCE_THRESHOLDS["rising_threshold"])
+        )
+
     def get_dxy_signal(self) -> str:
         """Get DXY signal for regime classification"""
         trend = self.analyze_dxy_trend()
@@ -141,9 +240,11 @@ class TrendAnalyzer:
 
         # DXY up = USD strength = RISK_OFF
         # DXY down = USD weakness = RISK_ON
-        if trend.direction == "UP" and trend.strength in ["STRONG", "WEAK"]:
+        if trend.strength_code == STR_NONE:
+            return "NEUTRAL"
+        if trend.direction_code == DIR_UP:
             return "RISK_OFF"
-        elif trend.direction == "DOWN" and trend.strength in ["STRONG", "WEAK"]:
+        elif trend.direction_code == DIR_DOWN:
             return "RISK_ON"
         else:
             return "NEUTRAL"
@@ -156,9 +257,11 @@ class TrendAnalyzer:
 
         # BTC.D rising = BTC outperforming alts = could be flight to safety or BTC strength
         # BTC.D falling = Alts outperforming = RISK_ON for crypto
-        if trend.direction == "UP" and trend.strength in ["STRONG", "WEAK"]:
+        if trend.strength_code == STR_NONE:
+            return "NEUTRAL"
+        if trend.direction_code == DIR_UP:
             return "BTC_STRENGTH"
-        elif trend.direction == "DOWN" and trend.strength in ["STRONG", "WEAK"]:
+        elif trend.direction_code == DIR_DOWN:
             return "ALTCOIN_STRENGTH"
         else:
             return "NEUTRAL"
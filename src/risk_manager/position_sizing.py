@@ -4,8 +4,9 @@ Dynamic position sizing based on regime, account balance, and trade setup
 """
 
 import logging
+import time
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from src.models import RegimeOutput
@@ -15,7 +16,7 @@ from src.config import RISK_THRESHOLDS, settings
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PositionSize:
     """Calculated position size"""
     quantity: float  # BTC quantity
@@ -28,6 +29,25 @@ class PositionSize:
     rejection_reason: Optional[str] = None
 
 
+def _rejected(reason: str) -> PositionSize:
+    """Zero-size, unapproved position with the given reason"""
+    return PositionSize(
+        quantity=0.0,
+        notional_value=0.0,
+        risk_amount=0.0,
+        risk_percent=0.0,
+        stop_distance=0.0,
+        reward_ratio=0.0,
+        approved=False,
+        rejection_reason=reason
+    )
+
+
+# Rejections with a fixed reason are shared (PositionSize is frozen)
+_REJECT_NO_STOP = _rejected("No stop loss defined")
+_REJECT_STOP_TOO_CLOSE = _rejected("Stop loss too close to entry")
+
+
 class RiskManager:
     """
     Manages position sizing and risk limits.
@@ -47,26 +67,48 @@ class RiskManager:
         self.max_daily_loss_percent = settings.max_daily_loss
         self.max_open_positions = RISK_THRESHOLDS["max_open_positions"]
         self.min_risk_reward = RISK_THRESHOLDS["min_risk_reward_ratio"]
+        self._max_position = RISK_THRESHOLDS["max_position_size_usd"]
+        self._refresh_balance_limits()
 
         self.daily_pnl = 0.0
         self.trade_count_today = 0
         self.open_positions = 0
+        # Last daily-loss rejection, reused while (daily_pnl, max_daily_loss) is unchanged
+        self._daily_loss_key: Optional[tuple[float, float]] = None
+        self._daily_loss_rejection: Optional[PositionSize] = None
 
         self.last_reset = datetime.now().date()
+        self._next_reset_at = self._next_midnight(self.last_reset)
+
+    @staticmethod
+    def _next_midnight(day) -> float:
+        """Epoch seconds of the local midnight that ends `day`"""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
 
     def _reset_daily_stats(self):
         """Reset daily statistics at start of new day"""
+        # Called on every sizing/status call: a float compare until the day rolls over
+        if time.time() < self._next_reset_at:
+            return
+
         today = datetime.now().date()
         if today > self.last_reset:
-            logger.info(f"Resetting daily stats. Previous PnL: ${self.daily_pnl:.2f}")
+            logger.info("Resetting daily stats. Previous PnL: $%.2f", self.daily_pnl)
             self.daily_pnl = 0.0
             self.trade_count_today = 0
             self.last_reset = today
+        self._next_reset_at = self._next_midnight(today)
+
+    def _refresh_balance_limits(self):
+        """Recompute the USD amounts derived from the account balance"""
+        self._base_risk_amount = self.account_balance * (self.base_risk_percent / 100)
+        self._max_daily_loss = self.account_balance * (self.max_daily_loss_percent / 100)
 
     def update_account_balance(self, new_balance: float):
         """Update account balance"""
         self.account_balance = new_balance
-        logger.info(f"Account balance updated: ${new_balance:.2f}")
+        self._refresh_balance_limits()
+        logger.info("Account balance updated: $%.2f", new_balance)
 
     def record_trade_result(self, pnl: float):
         """Record trade PnL"""
@@ -74,21 +116,39 @@ class RiskManager:
         self.daily_pnl += pnl
         self.trade_count_today += 1
         logger.info(
-            f"Trade recorded: PnL ${pnl:.2f} | "
-            f"Daily PnL: ${self.daily_pnl:.2f} | "
-            f"Trades today: {self.trade_count_today}"
+            "Trade recorded: PnL $%.2f | Daily PnL: $%.2f | Trades today: %s",
+            pnl, self.daily_pnl, self.trade_count_today
         )
 
     def _check_daily_loss_limit(self) -> tuple[bool, Optional[str]]:
         """Check if daily loss limit has been hit"""
+        rejection = self._daily_loss_rejected()
+        if rejection is not None:
+            return False, rejection.rejection_reason
+
+        return True, None
+
+    def _daily_loss_rejected(self) -> Optional[PositionSize]:
+        """
+        Rejection for a hit daily loss limit, or None if trading is allowed
+        Once the limit is hit every signal is rejected with the same reason until
+        PnL or balance changes, so the rejection is built once and reused
+        """
         self._reset_daily_stats()
 
-        max_daily_loss = self.account_balance * (self.max_daily_loss_percent / 100)
+        daily_pnl = self.daily_pnl
+        max_daily_loss = self._max_daily_loss
 
-        if abs(self.daily_pnl) >= max_daily_loss and self.daily_pnl < 0:
-            return False, f"Daily loss limit hit: ${self.daily_pnl:.2f} / ${max_daily_loss:.2f}"
+        if abs(daily_pnl) >= max_daily_loss and daily_pnl < 0:
+            key = (daily_pnl, max_daily_loss)
+            if key != self._daily_loss_key:
+                self._daily_loss_key = key
+                self._daily_loss_rejection = _rejected(
+                    f"Daily loss limit hit: ${daily_pnl:.2f} / ${max_daily_loss:.2f}"
+                )
+            return self._daily_loss_rejection
 
-        return True, None
+        return None
 
     def _check_open_positions_limit(self) -> tuple[bool, Optional[str]]:
         """Check if max open positions limit reached"""
@@ -114,35 +174,17 @@ class RiskManager:
         """
 
         # Check daily loss limit
-        can_trade, reason = self._check_daily_loss_limit()
-        if not can_trade:
-            return PositionSize(
-                quantity=0.0,
-                notional_value=0.0,
-                risk_amount=0.0,
-                risk_percent=0.0,
-                stop_distance=0.0,
-                reward_ratio=0.0,
-                approved=False,
-                rejection_reason=reason
-            )
+        rejection = self._daily_loss_rejected()
+        if rejection is not None:
+            return rejection
 
         # Check open positions limit
         can_trade, reason = self._check_open_positions_limit()
         if not can_trade:
-            return PositionSize(
-                quantity=0.0,
-                notional_value=0.0,
-                risk_amount=0.0,
-                risk_percent=0.0,
-                stop_distance=0.0,
-                reward_ratio=0.0,
-                approved=False,
-                rejection_reason=reason
-            )
+            return _rejected(reason)
 
-        # Calculate base risk amount
-        base_risk_amount = self.account_balance * (self.base_risk_percent / 100)
+        # Base risk amount (cached from the account balance)
+        base_risk_amount = self._base_risk_amount
 
         # Apply regime multiplier
         regime_multiplier = 1.0
@@ -157,38 +199,20 @@ class RiskManager:
 
         # Calculate stop distance
         if not signal.stop_loss:
-            return PositionSize(
-                quantity=0.0,
-                notional_value=0.0,
-                risk_amount=0.0,
-                risk_percent=0.0,
-                stop_distance=0.0,
-                reward_ratio=0.0,
-                approved=False,
-                rejection_reason="No stop loss defined"
-            )
+            return _REJECT_NO_STOP
 
         stop_distance = abs(current_price - signal.stop_loss)
         stop_distance_usd = stop_distance
 
         if stop_distance_usd == 0:
-            return PositionSize(
-                quantity=0.0,
-                notional_value=0.0,
-                risk_amount=0.0,
-                risk_percent=0.0,
-                stop_distance=0.0,
-                reward_ratio=0.0,
-                approved=False,
-                rejection_reason="Stop loss too close to entry"
-            )
+            return _REJECT_STOP_TOO_CLOSE
 
         # Calculate position quantity
         quantity_btc = risk_amount / stop_distance_usd
         notional_value = quantity_btc * current_price
 
         # Check if notional value exceeds max
-        max_position = RISK_THRESHOLDS["max_position_size_usd"]
+        max_position = self._max_position
         if notional_value > max_position:
             # Scale down
             quantity_btc = max_position / current_price
@@ -230,10 +254,8 @@ class RiskManager:
         )
 
         logger.info(
-            f"Position Sizing: {quantity_btc:.4f} BTC (${notional_value:.2f}) | "
-            f"Risk: ${risk_amount:.2f} ({risk_percent:.2f}%) | "
-            f"R:R {reward_ratio:.2f} | "
-            f"Regime multiplier: {regime_multiplier:.2f}"
+            "Position Sizing: %.4f BTC ($%.2f) | Risk: $%.2f (%.2f%%) | R:R %.2f | Regime multiplier: %.2f",
+            quantity_btc, notional_value, risk_amount, risk_percent, reward_ratio, regime_multiplier
         )
 
         return position
@@ -241,19 +263,19 @@ class RiskManager:
     def increment_open_positions(self):
         """Increment open positions counter"""
         self.open_positions += 1
-        logger.info(f"Open positions: {self.open_positions}/{self.max_open_positions}")
+        logger.info("Open positions: %s/%s", self.open_positions, self.max_open_positions)
 
     def decrement_open_positions(self):
         """Decrement open positions counter"""
         if self.open_positions > 0:
             self.open_positions -= 1
-        logger.info(f"Open positions: {self.open_positions}/{self.max_open_positions}")
+        logger.info("Open positions: %s/%s", self.open_positions, self.max_open_positions)
 
     def get_status(self) -> Dict[str, Any]:
         """Get risk manager status"""
         self._reset_daily_stats()
 
-        max_daily_loss = self.account_balance * (self.max_daily_loss_percent / 100)
+        max_daily_loss = self._max_daily_loss
         daily_loss_remaining = max_daily_loss - abs(self.daily_pnl) if self.daily_pnl < 0 else max_daily_loss
 
         return {
@@ -272,7 +294,7 @@ class RiskManager:
                 "limit_reached": self.open_positions >= self.max_open_positions
             },
             "risk_thresholds": {
-                "max_position_size_usd": RISK_THRESHOLDS["max_position_size_usd"],
+                "max_position_size_usd": self._max_position,
                 "min_risk_reward": self.min_risk_reward
             }
         }
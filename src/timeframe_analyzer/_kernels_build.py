@@ -0,0 +1,24 @@
+"""
+Ahead-of-time build of the timeframe analyzer kernels
+Produces the `tf_kernels` extension next to this file, so processes that import
+the analyzer (backtests, parameter sweeps) skip Numba's JIT compile entirely.
+
+Usage (requires numba at build time only):
+    python -m src.timeframe_analyzer._kernels_build
+"""
+
+import os
+
+from numba.pycc import CC
+
+from src.timeframe_analyzer._numba_kernels import count_swings
+
+cc = CC("tf_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Same source as the JIT kernel; py_func is the undecorated Python function
+cc.export("count_swings", "UniTuple(i8, 4)(f8[:])")(count_swings.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
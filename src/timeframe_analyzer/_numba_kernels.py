@@ -0,0 +1,44 @@
+"""
+Numba kernels for the timeframe analyzer
+Compiled lazily on first call; see src.utils.jit for the no-numba fallback
+"""
+
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def count_swings(closes):
+    """
+    Tally rolling 5-bar swing steps in one pass.
+
+    Rolling highs/lows are taken over every 5-bar window except the one ending
+    on the last bar. Returns (higher_highs, higher_lows, lower_highs, lower_lows),
+    counting strict steps between consecutive windows.
+    """
+    n = len(closes) - 5
+    higher_highs = higher_lows = lower_highs = lower_lows = 0
+    prev_high = prev_low = 0.0
+
+    for i in range(n):
+        high = low = closes[i]
+        for k in range(1, 5):
+            value = closes[i + k]
+            if value > high:
+                high = value
+            if value < low:
+                low = value
+
+        if i > 0:
+            if high > prev_high:
+                higher_highs += 1
+            elif high < prev_high:
+                lower_highs += 1
+            if low > prev_low:
+                higher_lows += 1
+            elif low < prev_low:
+                lower_lows += 1
+
+        prev_high = high
+        prev_low = low
+
+    return higher_highs, higher_lows, lower_highs, lower_lows
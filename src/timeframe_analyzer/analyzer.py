@@ -1,18 +1,76 @@
+import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from src.config import Timeframe
 from src.data_ingestion import BybitRESTClient
-from src.models import OHLCV, RegimeOutput
+from src.models import OHLCVBatch, RegimeOutput
 from src.capital_flow import CapitalFlowSignal
 from src.liquidity_engine import LiquidityLevel
+from src.utils.jit import NUMBA_AVAILABLE
+
+try:
+    # Ahead-of-time build from _kernels_build.py: no JIT warm-up, works without numba
+    from .tf_kernels import count_swings
+
+    _USE_KERNELS = True
+except ImportError:
+    from ._numba_kernels import count_swings
+
+    _USE_KERNELS = NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Regime state -> implied bias (anything else is NEUTRAL)
+_REGIME_BIAS = {
+    "RISK_ON": "BULLISH",
+    "EXPANSION": "BULLISH",
+    "RISK_OFF": "BEARISH",
+    "CONTRACTION": "BEARISH",
+}
+
+
+def _count_swings_numpy(closes: np.ndarray) -> tuple[int, int, int, int]:
+    """NumPy equivalent of _numba_kernels.count_swings for environments without numba"""
+    # Rolling 5-bar highs and lows, reduced over the 5 shifted slices
+    # (cheaper than sliding_window_view at this size)
+    n = len(closes) - 5
+    shifted = [closes[k:k + n] for k in range(5)]
+    high_steps = np.diff(np.maximum.reduce(shifted))
+    low_steps = np.diff(np.minimum.reduce(shifted))
+
+    return (
+        np.count_nonzero(high_steps > 0),
+        np.count_nonzero(low_steps > 0),
+        np.count_nonzero(high_steps < 0),
+        np.count_nonzero(low_steps < 0),
+    )
+
+
+# Below this many levels the plain Python scan beats building arrays
+_VECTORIZED_LIQUIDITY_MIN = 128
+
+
+def nearby_liquidity_indices(
+    prices: np.ndarray, broken: np.ndarray, current_price: float, threshold: float = 0.02, limit: int = 3
+) -> np.ndarray:
+    """
+    Indices of the unbroken levels within threshold % of current_price, closest first
+    Ties keep their input order (stable sort), matching the list-based scan
+    """
+    distances = np.abs(prices - current_price)
+    candidates = np.flatnonzero(~broken & (distances / current_price <= threshold))
+    order = np.argsort(distances[candidates], kind="stable")
+    return candidates[order[:limit]]
 
-@dataclass
+
+@dataclass(slots=True)
 class TimeframeBias:
     """Represents the market bias for a specific timeframe"""
     timeframe: str
@@ -41,8 +99,39 @@ class TimeframeAnalyzer:
         "Daily": (Timeframe.ONE_DAY, 100),
     }
 
+    # Seconds a kline fetch is reused: a fraction of the bar, since the live bar keeps moving
+    KLINE_TTL = {
+        Timeframe.FIFTEEN_MINUTE: 60,
+        Timeframe.ONE_HOUR: 300,
+        Timeframe.FOUR_HOUR: 900,
+        Timeframe.ONE_DAY: 3600,
+    }
+
     def __init__(self, bybit_rest: BybitRESTClient):
         self.bybit_rest = bybit_rest
+        # (symbol, timeframe, limit) -> (monotonic expiry, klines as columns)
+        self._kline_cache: Dict[Tuple[str, Timeframe, int], Tuple[float, OHLCVBatch]] = {}
+
+    async def _get_klines(self, symbol: str, timeframe: Timeframe, limit: int) -> OHLCVBatch:
+        """
+        Fetch klines as column arrays, reusing a previous fetch for up to KLINE_TTL seconds
+        The candle objects are converted once per fetch, not once per analysis
+        """
+        key = (symbol, timeframe, limit)
+        now = time.monotonic()
+
+        cached = self._kline_cache.get(key)
+        if cached is not None and now < cached[0]:
+            return cached[1]
+
+        klines = OHLCVBatch.from_klines(await self.bybit_rest.get_klines(symbol, timeframe, limit))
+        if len(klines):
+            self._kline_cache[key] = (now + self.KLINE_TTL.get(timeframe, 0), klines)
+        return klines
+
+    def flush(self):
+        """Drop all cached klines so the next analysis refetches"""
+        self._kline_cache.clear()
 
     async def analyze_all_timeframes(
         self,
@@ -63,11 +152,10 @@ class TimeframeAnalyzer:
         Returns:
             Dictionary mapping timeframe names to TimeframeBias objects
         """
-        results = {}
-
-        for tf_name, (tf_enum, limit) in self.TIMEFRAMES.items():
-            try:
-                bias = await self._analyze_timeframe(
+        # Timeframes are independent, so their kline requests run concurrently
+        outcomes = await asyncio.gather(
+            *(
+                self._analyze_timeframe(
                     symbol=symbol,
                     timeframe_name=tf_name,
                     timeframe=tf_enum,
@@ -76,9 +164,15 @@ class TimeframeAnalyzer:
                     capital_flow=capital_flow,
                     liquidity_levels=liquidity_levels,
                 )
-                results[tf_name] = bias
-            except Exception as e:
-                logger.error(f"Error analyzing {tf_name} timeframe: {e}")
+                for tf_name, (tf_enum, limit) in self.TIMEFRAMES.items()
+            ),
+            return_exceptions=True,
+        )
+
+        results = {}
+        for tf_name, outcome in zip(self.TIMEFRAMES, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error analyzing {tf_name} timeframe: {outcome}")
                 # Return neutral bias on error
                 results[tf_name] = TimeframeBias(
                     timeframe=tf_name,
@@ -89,10 +183,15 @@ class TimeframeAnalyzer:
                     trend_strength=0.0,
                     ma_alignment="UNKNOWN",
                     supporting_factors=[],
-                    conflicting_factors=[f"Error fetching data: {str(e)}"],
+                    conflicting_factors=[f"Error fetching data: {str(outcome)}"],
                     explanation="Unable to analyze timeframe due to data unavailability.",
                     timestamp=datetime.now(),
                 )
+            elif isinstance(outcome, BaseException):
+                # e.g. cancellation: don't mask it as a neutral bias
+                raise outcome
+            else:
+                results[tf_name] = outcome
 
         return results
 
@@ -108,19 +207,20 @@ class TimeframeAnalyzer:
     ) -> TimeframeBias:
         """Analyze a single timeframe"""
         # Fetch klines
-        klines = await self.bybit_rest.get_klines(symbol, timeframe, limit)
+        klines = await self._get_klines(symbol, timeframe, limit)
 
-        if not klines or len(klines) < 20:
+        if len(klines) < 20:
             raise ValueError(f"Insufficient data for {timeframe_name}")
 
-        # Calculate technical indicators
-        closes = [k.close for k in klines]
-        current_price = closes[-1]
+        # Calculate technical indicators on the contiguous close column
+        closes = klines.close
+        current_price = float(closes[-1])
 
-        # Moving averages
-        ma_20 = sum(closes[-20:]) / 20
-        ma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else ma_20
-        ma_100 = sum(closes[-100:]) / 100 if len(closes) >= 100 else ma_50
+        # Moving averages from one running sum over the newest (up to) 100 closes, newest first
+        tail_sums = np.cumsum(closes[:-101:-1])
+        ma_20 = float(tail_sums[19]) / 20
+        ma_50 = float(tail_sums[49]) / 50 if len(closes) >= 50 else ma_20
+        ma_100 = float(tail_sums[99]) / 100 if len(closes) >= 100 else ma_50
 
         # Trend direction and strength
         trend_direction = self._calculate_trend_direction(closes)
@@ -182,14 +282,14 @@ class TimeframeAnalyzer:
             timestamp=datetime.now(),
         )
 
-    def _calculate_trend_direction(self, closes: List[float]) -> str:
+    def _calculate_trend_direction(self, closes: np.ndarray) -> str:
         """Calculate overall trend direction"""
         if len(closes) < 20:
             return "UNKNOWN"
 
         # Compare recent price action to older price action
-        recent_avg = sum(closes[-10:]) / 10
-        older_avg = sum(closes[-20:-10]) / 10
+        recent_avg = closes[-10:].mean()
+        older_avg = closes[-20:-10].mean()
 
         if recent_avg > older_avg * 1.01:  # 1% threshold
             return "UP"
@@ -198,34 +298,25 @@ class TimeframeAnalyzer:
         else:
             return "SIDEWAYS"
 
-    def _calculate_trend_strength(self, closes: List[float]) -> float:
+    def _calculate_trend_strength(self, closes: np.ndarray) -> float:
         """Calculate trend strength (0-1)"""
         if len(closes) < 20:
             return 0.0
 
-        # Count higher highs and higher lows for uptrend
-        # Count lower highs and lower lows for downtrend
-        highs = []
-        lows = []
-
-        for i in range(len(closes) - 5):
-            window = closes[i : i + 5]
-            highs.append(max(window))
-            lows.append(min(window))
-
-        if len(highs) < 2:
+        # Rolling 5-bar highs and lows over every window except the one ending on the last bar
+        windows = len(closes) - 5
+        if windows < 2:
             return 0.0
 
-        # Check for consistent trend
-        higher_highs = sum(1 for i in range(1, len(highs)) if highs[i] > highs[i - 1])
-        higher_lows = sum(1 for i in range(1, len(lows)) if lows[i] > lows[i - 1])
-        lower_highs = sum(1 for i in range(1, len(highs)) if highs[i] < highs[i - 1])
-        lower_lows = sum(1 for i in range(1, len(lows)) if lows[i] < lows[i - 1])
+        # Count higher highs and higher lows for uptrend
+        # Count lower highs and lower lows for downtrend
+        swings = count_swings(closes) if _USE_KERNELS else _count_swings_numpy(closes)
+        higher_highs, higher_lows, lower_highs, lower_lows = swings
 
-        uptrend_strength = (higher_highs + higher_lows) / (2 * (len(highs) - 1))
-        downtrend_strength = (lower_highs + lower_lows) / (2 * (len(highs) - 1))
+        uptrend_strength = (higher_highs + higher_lows) / (2 * (windows - 1))
+        downtrend_strength = (lower_highs + lower_lows) / (2 * (windows - 1))
 
-        return max(uptrend_strength, downtrend_strength)
+        return float(max(uptrend_strength, downtrend_strength))
 
     def _calculate_ma_alignment(
         self, current_price: float, ma_20: float, ma_50: float, ma_100: float
@@ -242,13 +333,13 @@ class TimeframeAnalyzer:
         else:
             return "MIXED"
 
-    def _calculate_momentum(self, closes: List[float]) -> float:
+    def _calculate_momentum(self, closes: np.ndarray) -> float:
         """Calculate price momentum (-1 to 1)"""
         if len(closes) < 20:
             return 0.0
 
         # Rate of change over last 20 periods
-        roc = (closes[-1] - closes[-20]) / closes[-20]
+        roc = float((closes[-1] - closes[-20]) / closes[-20])
 
         # Normalize to -1 to 1 range (assuming max 10% move)
         return max(-1.0, min(1.0, roc * 10))
@@ -264,43 +355,22 @@ class TimeframeAnalyzer:
         momentum: float,
     ) -> tuple[str, float]:
         """Determine bias and confidence based on indicators"""
-        bullish_signals = 0
-        bearish_signals = 0
-        total_signals = 0
-
-        # Price vs MAs
-        if current_price > ma_20:
-            bullish_signals += 1
-        else:
-            bearish_signals += 1
-        total_signals += 1
-
-        if current_price > ma_50:
-            bullish_signals += 1
-        else:
-            bearish_signals += 1
-        total_signals += 1
-
-        # Trend direction
-        if trend_direction == "UP":
-            bullish_signals += 2  # Weight trend more heavily
-        elif trend_direction == "DOWN":
-            bearish_signals += 2
-        total_signals += 2
-
-        # Momentum
-        if momentum > 0.1:
-            bullish_signals += 1
-        elif momentum < -0.1:
-            bearish_signals += 1
-        total_signals += 1
-
-        # MA alignment
-        if ma_20 > ma_50 > ma_100:
-            bullish_signals += 1
-        elif ma_20 < ma_50 < ma_100:
-            bearish_signals += 1
-        total_signals += 1
+        # Each indicator votes as a 0/1 flag: price vs MA20/MA50 (one vote each way),
+        # trend direction (weighted 2), momentum and MA alignment
+        above_mas = (current_price > ma_20) + (current_price > ma_50)
+        bullish_signals = (
+            above_mas
+            + 2 * (trend_direction == "UP")
+            + (momentum > 0.1)
+            + (ma_20 > ma_50 > ma_100)
+        )
+        bearish_signals = (
+            (2 - above_mas)
+            + 2 * (trend_direction == "DOWN")
+            + (momentum < -0.1)
+            + (ma_20 < ma_50 < ma_100)
+        )
+        total_signals = 6
 
         # Determine bias
         if bullish_signals > bearish_signals * 1.5:
@@ -392,50 +462,50 @@ class TimeframeAnalyzer:
             elif capital_flow.bias != "NEUTRAL" and capital_flow.bias != bias:
                 conflicting.append(f"Capital flow suggests {capital_flow.bias.lower()} bias")
 
-        # Liquidity factors
-        if liquidity_levels:
+        # Liquidity factors (only read for a directional bias, so NEUTRAL skips the scan)
+        if liquidity_levels and bias != "NEUTRAL":
             nearby_levels = self._find_nearby_liquidity(current_price, liquidity_levels)
-            if nearby_levels:
-                if bias == "BULLISH":
-                    resistance = [l for l in nearby_levels if l.price > current_price]
-                    support = [l for l in nearby_levels if l.price < current_price]
-                    if support:
-                        supporting.append(f"Support level at ${support[0].price:,.2f}")
-                    if resistance:
-                        conflicting.append(f"Resistance level at ${resistance[0].price:,.2f}")
-                elif bias == "BEARISH":
-                    resistance = [l for l in nearby_levels if l.price > current_price]
-                    support = [l for l in nearby_levels if l.price < current_price]
-                    if resistance:
-                        supporting.append(f"Resistance level at ${resistance[0].price:,.2f}")
-                    if support:
-                        conflicting.append(f"Support level at ${support[0].price:,.2f}")
+            # Closest level on each side, if any
+            resistance = next((l for l in nearby_levels if l.price > current_price), None)
+            support = next((l for l in nearby_levels if l.price < current_price), None)
+            if bias == "BULLISH":
+                if support:
+                    supporting.append(f"Support level at ${support.price:,.2f}")
+                if resistance:
+                    conflicting.append(f"Resistance level at ${resistance.price:,.2f}")
+            elif bias == "BEARISH":
+                if resistance:
+                    supporting.append(f"Resistance level at ${resistance.price:,.2f}")
+                if support:
+                    conflicting.append(f"Support level at ${support.price:,.2f}")
 
         return supporting, conflicting
 
     def _regime_to_bias(self, regime_state: str) -> str:
         """Convert regime state to bias"""
-        if regime_state in ["RISK_ON", "EXPANSION"]:
-            return "BULLISH"
-        elif regime_state in ["RISK_OFF", "CONTRACTION"]:
-            return "BEARISH"
-        else:
-            return "NEUTRAL"
+        return _REGIME_BIAS.get(regime_state, "NEUTRAL")
 
     def _find_nearby_liquidity(
         self, current_price: float, levels: List[LiquidityLevel], threshold: float = 0.02
     ) -> List[LiquidityLevel]:
         """Find liquidity levels within threshold % of current price"""
+        if len(levels) >= _VECTORIZED_LIQUIDITY_MIN:
+            n = len(levels)
+            prices = np.fromiter((level.price for level in levels), dtype=np.float64, count=n)
+            broken = np.fromiter((level.broken for level in levels), dtype=bool, count=n)
+            return [levels[i] for i in nearby_liquidity_indices(prices, broken, current_price, threshold)]
+
+        # (distance, level) pairs: each distance is computed once, not per sort comparison
         nearby = []
         for level in levels:
             if not level.broken:
-                distance = abs(level.price - current_price) / current_price
-                if distance <= threshold:
-                    nearby.append(level)
+                distance = abs(level.price - current_price)
+                if distance / current_price <= threshold:
+                    nearby.append((distance, level))
 
-        # Sort by proximity
-        nearby.sort(key=lambda l: abs(l.price - current_price))
-        return nearby[:3]  # Return top 3 closest levels
+        # Sort by proximity (stable, so ties keep input order)
+        nearby.sort(key=itemgetter(0))
+        return [level for _, level in nearby[:3]]  # Return top 3 closest levels
 
     def _generate_explanation(
         self,
@@ -4,18 +4,32 @@ Handles order placement, position tracking, and trade lifecycle management
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping
 from datetime import datetime
+from collections import ChainMap, defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import time
+
+import numpy as np
 
 from src.execution_engine import ExecutionSignal, SignalType
 from src.risk_manager import PositionSize
-from src.config import OrderSide
+from src.config import settings, OrderSide
+from src.data_ingestion import BybitWsTradeClient, OrderStatusUnknown
 
 logger = logging.getLogger(__name__)
 
+# +1 for LONG, -1 for SHORT: folds both sides' SL/TP comparisons into one signed compare
+_SIDE_SIGN = {"LONG": 1.0, "SHORT": -1.0}
+
+# Entry signal -> (position side, entry order side, closing order side)
+_ENTRY_SIDES = {
+    SignalType.ENTRY_LONG: ("LONG", OrderSide.BUY, OrderSide.SELL),
+    SignalType.ENTRY_SHORT: ("SHORT", OrderSide.SELL, OrderSide.BUY),
+}
+
 
 class PositionStatus(str, Enum):
     PENDING = "PENDING"
@@ -25,7 +39,7 @@ class PositionStatus(str, Enum):
     ERROR = "ERROR"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Position:
     """Active or historical position"""
     position_id: str
@@ -44,6 +58,12 @@ class Position:
     signal_reason: str = ""
     order_ids: List[str] = field(default_factory=list)
     error_message: Optional[str] = None
+    # Monotonic stamps for duration math; entry/exit_time stay for display
+    entry_mono_ns: int = field(default_factory=time.monotonic_ns)
+    exit_mono_ns: Optional[int] = None
+    # Order sides resolved once at entry
+    entry_order_side: Optional[OrderSide] = None
+    close_order_side: Optional[OrderSide] = None
 
 
 class TradeManager:
@@ -59,12 +79,56 @@ class TradeManager:
     - Error recovery
     """
 
-    def __init__(self, bybit_rest_client=None):
+    def __init__(self, bybit_rest_client=None, ws_trade_client: Optional[BybitWsTradeClient] = None):
         self.bybit_client = bybit_rest_client
-        self.positions: Dict[str, Position] = {}
+        # Open and finished (closed or errored) positions are stored separately so
+        # per-tick work only touches open ones; `positions` is a combined lookup view.
+        # Entries whose order outcome is still unknown wait in the pending store
+        self._open_positions: Dict[str, Position] = {}
+        self._pending_positions: Dict[str, Position] = {}
+        self._finished_positions: Dict[str, Position] = {}
+        self.positions: Mapping[str, Position] = ChainMap(
+            self._open_positions, self._pending_positions, self._finished_positions
+        )
+        self._reconcile_tasks: set = set()
         self.position_counter = 0
+        # Per-symbol locks: a close on one symbol never waits on order traffic for another
+        self._symbol_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._id_prefix_second = -1
+        self._id_prefix = ""
+
+        # Running totals maintained at state transitions, so status queries
+        # don't rescan the position history
+        self._closed_count = 0
+        self._winning_count = 0
+        self._losing_count = 0
+        self._total_pnl = 0.0
         self.dry_run = True  # Safety: start in dry-run mode
 
+        # Open positions as parallel arrays for the per-tick exit checks,
+        # rebuilt lazily whenever a position opens or closes
+        self._exit_arrays_stale = True
+        self._open_ids: List[str] = []
+        self._open_symbols = np.empty(0, dtype=object)
+        self._open_side_sign = np.empty(0)
+        self._open_sl = np.empty(0)
+        self._open_tp = np.empty(0)
+
+        # Exit closes requested from the tick path: queued here and drained by one
+        # long-lived worker task instead of spawning a task per close
+        self._close_queue: deque = deque()
+        self._close_pending: set = set()
+        self._close_ready = asyncio.Event()
+        self._close_worker_task: Optional[asyncio.Task] = None
+
+        # Orders go over one persistent WebSocket trade session (connected on first order)
+        if ws_trade_client is None and settings.use_ws_trade_api:
+            ws_trade_client = BybitWsTradeClient(rest_client=bybit_rest_client)
+        self.ws_trade = ws_trade_client
+        # REST is used to reconcile closes the exchange made itself (attached SL/TP)
+        if self.bybit_client is None and self.ws_trade is not None:
+            self.bybit_client = self.ws_trade.rest
+
     def enable_live_trading(self):
         """Enable live trading (disable dry-run)"""
         logger.warning("🚨 LIVE TRADING ENABLED - Real orders will be placed!")
@@ -75,11 +139,106 @@ class TradeManager:
         logger.info("Dry-run mode enabled - No real orders will be placed")
         self.dry_run = True
 
+    async def aclose(self):
+        """Stop the close worker and close the WebSocket trade session, if one was opened"""
+        if self._close_worker_task and not self._close_worker_task.done():
+            self._close_worker_task.cancel()
+        for task in self._reconcile_tasks:
+            task.cancel()
+        if self.ws_trade:
+            await self.ws_trade.aclose()
+
+    def _request_close(self, position_id: str, exit_price: float, reason: str):
+        """Queue an exit close; a position already queued is not queued twice"""
+        if position_id in self._close_pending:
+            return
+
+        self._close_pending.add(position_id)
+        self._close_queue.append((position_id, exit_price, reason))
+        if self._close_worker_task is None or self._close_worker_task.done():
+            self._close_worker_task = asyncio.create_task(self._close_worker())
+        self._close_ready.set()
+
+    async def _close_worker(self):
+        """Drain queued exit closes, closing each batch concurrently"""
+        while True:
+            await self._close_ready.wait()
+            self._close_ready.clear()
+
+            batch = []
+            while self._close_queue:
+                batch.append(self._close_queue.popleft())
+
+            results = await asyncio.gather(
+                *(self.close_position(*request) for request in batch),
+                return_exceptions=True
+            )
+            for (position_id, _, _), result in zip(batch, results):
+                self._close_pending.discard(position_id)
+                if isinstance(result, Exception):
+                    logger.error("Error closing position %s: %s", position_id, result)
+
+    async def _place_market_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        qty: float,
+        reduce_only: bool = False,
+        cl_order_id: Optional[str] = None,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Place a market order; returns the exchange acknowledgement or None on failure"""
+        if self.ws_trade is None:
+            logger.warning("REST order placement not implemented - enable use_ws_trade_api")
+            return None
+
+        return await self.ws_trade.send_order(
+            symbol, side, qty,
+            reduce_only=reduce_only,
+            cl_order_id=cl_order_id,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+        )
+
+    def _track_open(self, position: Position):
+        """Register a position that just opened"""
+        self._open_positions[position.position_id] = position
+        self._exit_arrays_stale = True
+
+    def _track_exit(self, position: Position):
+        """Move a position that was just closed or errored out of the open store"""
+        del self._open_positions[position.position_id]
+        self._finished_positions[position.position_id] = position
+        self._exit_arrays_stale = True
+
+        if position.status == PositionStatus.CLOSED:
+            self._closed_count += 1
+            self._total_pnl += position.pnl
+            if position.pnl > 0:
+                self._winning_count += 1
+            elif position.pnl < 0:
+                self._losing_count += 1
+
+    def _refresh_exit_arrays(self):
+        """Rebuild the open-position arrays (missing SL/TP become NaN, which never triggers)"""
+        open_positions = [p for p in self._open_positions.values() if p.side in _SIDE_SIGN]
+        self._open_ids = [p.position_id for p in open_positions]
+        self._open_symbols = np.array([p.symbol for p in open_positions], dtype=object)
+        self._open_side_sign = np.array([_SIDE_SIGN[p.side] for p in open_positions], dtype=np.float64)
+        self._open_sl = np.array([p.stop_loss or np.nan for p in open_positions], dtype=np.float64)
+        self._open_tp = np.array([p.take_profit or np.nan for p in open_positions], dtype=np.float64)
+        self._exit_arrays_stale = False
+
     def _generate_position_id(self) -> str:
         """Generate unique position ID"""
         self.position_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"POS_{timestamp}_{self.position_counter}"
+        # The timestamp only has second resolution, so format it once per second
+        now_s = int(time.time())
+        if now_s != self._id_prefix_second:
+            self._id_prefix_second = now_s
+            self._id_prefix = datetime.fromtimestamp(now_s).strftime("POS_%Y%m%d%H%M%S_")
+        return f"{self._id_prefix}{self.position_counter}"
 
     async def open_position(
         self,
@@ -91,25 +250,21 @@ class TradeManager:
         Open a new position based on signal and position size.
 
         In dry-run mode: simulates the trade
-        In live mode: places actual orders via Bybit API
+        In live mode: places actual orders via Bybit API. If the entry's outcome
+        is unknown (no ack, lookup failed) the position is returned PENDING and
+        reconciled in the background
         """
 
         if not position_size.approved:
-            logger.warning(
-                f"Position size not approved: {position_size.rejection_reason}"
-            )
+            logger.warning("Position size not approved: %s", position_size.rejection_reason)
             return None
 
         # Determine side
-        if signal.signal_type == SignalType.ENTRY_LONG:
-            side = "LONG"
-            order_side = OrderSide.BUY
-        elif signal.signal_type == SignalType.ENTRY_SHORT:
-            side = "SHORT"
-            order_side = OrderSide.SELL
-        else:
-            logger.error(f"Invalid signal type for opening position: {signal.signal_type}")
+        sides = _ENTRY_SIDES.get(signal.signal_type)
+        if sides is None:
+            logger.error("Invalid signal type for opening position: %s", signal.signal_type)
             return None
+        side, order_side, close_order_side = sides
 
         # Create position object
         position = Position(
@@ -122,66 +277,101 @@ class TradeManager:
             take_profit=signal.take_profit,
             status=PositionStatus.PENDING,
             entry_time=datetime.now(),
-            signal_reason=signal.reason
+            signal_reason=signal.reason,
+            entry_order_side=order_side,
+            close_order_side=close_order_side
         )
 
         logger.info(
-            f"{'[DRY RUN] ' if self.dry_run else ''}Opening {side} position: "
-            f"{position.quantity:.4f} {symbol} @ ${position.entry_price:.2f} | "
-            f"SL: ${position.stop_loss:.2f} | TP: ${position.take_profit:.2f}"
+            "%sOpening %s position: %.4f %s @ $%.2f | SL: $%.2f | TP: $%.2f",
+            "[DRY RUN] " if self.dry_run else "", side, position.quantity, symbol,
+            position.entry_price, position.stop_loss, position.take_profit
         )
 
         if self.dry_run:
             # Simulate successful order placement
             position.status = PositionStatus.OPEN
             position.order_ids = ["DRY_RUN_ORDER_" + position.position_id]
-            self.positions[position.position_id] = position
+            self._track_open(position)
 
             logger.info(
-                f"[DRY RUN] Position opened: {position.position_id} | "
-                f"Risk: ${position_size.risk_amount:.2f} | "
-                f"R:R: {position_size.reward_ratio:.2f}"
+                "[DRY RUN] Position opened: %s | Risk: $%.2f | R:R: %.2f",
+                position.position_id, position_size.risk_amount, position_size.reward_ratio
             )
 
             return position
 
         # LIVE TRADING: Place actual orders
         try:
-            # Note: Actual Bybit order placement would go here
-            # This is a template - actual implementation would use pybit or similar
-            logger.warning("Live trading not fully implemented - would place real order here")
-
-            # Placeholder for actual API call:
-            # order_result = await self._place_market_order(
-            #     symbol=symbol,
-            #     side=order_side,
-            #     qty=position.quantity
-            # )
-            #
-            # if order_result["success"]:
-            #     position.order_ids.append(order_result["orderId"])
-            #     position.status = PositionStatus.OPEN
-            #
-            #     # Place stop loss and take profit orders
-            #     if position.stop_loss:
-            #         await self._place_stop_loss(position)
-            #     if position.take_profit:
-            #         await self._place_take_profit(position)
-            #
-            #     self.positions[position.position_id] = position
-            #     return position
-
-            # For now, treat as error in live mode since not fully implemented
-            position.status = PositionStatus.ERROR
-            position.error_message = "Live trading not fully implemented"
-            return None
+            # Stop loss and take profit ride on the entry order, so one round trip opens the bracket
+            async with self._symbol_locks[symbol]:
+                order_result = await self._place_market_order(
+                    symbol=symbol,
+                    side=order_side,
+                    qty=position.quantity,
+                    cl_order_id=position.position_id,
+                    stop_loss=position.stop_loss,
+                    take_profit=position.take_profit
+                )
+
+            if order_result is None:
+                position.status = PositionStatus.ERROR
+                position.error_message = "Entry order failed"
+                return None
+
+            self._apply_entry(position, order_result)
+            return position
+
+        except OrderStatusUnknown as e:
+            # The entry may have filled: keep the position PENDING and tracked until
+            # the exchange confirms either way, so no live exposure goes unmanaged
+            logger.error("%s - keeping %s pending until reconciled", e, position.position_id)
+            position.error_message = str(e)
+            self._pending_positions[position.position_id] = position
+            task = asyncio.create_task(self._reconcile_entry(position))
+            self._reconcile_tasks.add(task)
+            task.add_done_callback(self._reconcile_tasks.discard)
+            return position
 
         except Exception as e:
-            logger.error(f"Error opening position: {e}")
+            logger.error("Error opening position: %s", e)
             position.status = PositionStatus.ERROR
             position.error_message = str(e)
             return None
 
+    def _apply_entry(self, position: Position, order_result: Dict[str, Any]):
+        """Mark a position open from its entry order acknowledgement"""
+        position.order_ids.append(order_result["orderId"])
+        position.quantity = order_result["qty"]  # Rounded to the instrument's qtyStep
+        position.entry_time = order_result["ack_time"]
+        position.status = PositionStatus.OPEN
+        self._track_open(position)
+
+    async def _reconcile_entry(self, position: Position, retry_delay: float = 2.0):
+        """Resolve a PENDING entry by its orderLinkId, retrying until the exchange answers"""
+        while True:
+            try:
+                order_result = await self.ws_trade.lookup_order(
+                    position.symbol, position.position_id, position.quantity
+                )
+                break
+            except OrderStatusUnknown:
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60.0)
+
+        async with self._symbol_locks[position.symbol]:
+            del self._pending_positions[position.position_id]
+            if order_result is None:
+                position.status = PositionStatus.ERROR
+                position.error_message = "Entry order was not placed"
+                self._finished_positions[position.position_id] = position
+                return
+
+            position.error_message = None
+            self._apply_entry(position, order_result)
+
+        logger.info("Pending position %s reconciled as open", position.position_id)
+
     async def close_position(
         self,
         position_id: str,
@@ -196,20 +386,66 @@ class TradeManager:
         """
 
         if position_id not in self.positions:
-            logger.error(f"Position {position_id} not found")
+            logger.error("Position %s not found", position_id)
             return False
 
         position = self.positions[position_id]
 
+        # Serialize closes per symbol; the status check happens under the lock so a
+        # concurrent close of the same position can't send a second order
+        async with self._symbol_locks[position.symbol]:
+            return await self._close_locked(position, exit_price, reason)
+
+    async def _close_locked(self, position: Position, exit_price: float, reason: str) -> bool:
+        """Body of close_position, run while holding the position's symbol lock"""
+        position_id = position.position_id
+
         if position.status != PositionStatus.OPEN:
-            logger.warning(f"Position {position_id} is not open (status: {position.status})")
+            logger.warning("Position %s is not open (status: %s)", position_id, position.status)
             return False
 
         logger.info(
-            f"{'[DRY RUN] ' if self.dry_run else ''}Closing position {position_id} | "
-            f"Reason: {reason} | Exit: ${exit_price:.2f}"
+            "%sClosing position %s | Reason: %s | Exit: $%.2f",
+            "[DRY RUN] " if self.dry_run else "", position_id, reason, exit_price
         )
 
+        exit_time = None
+        if not self.dry_run:
+            # LIVE TRADING: Place closing market order (reduce-only, so it cannot flip the position)
+            error = "Closing order failed"
+            try:
+                close_side = position.close_order_side
+                if close_side is None:  # Position built outside open_position
+                    close_side = OrderSide.SELL if position.side == "LONG" else OrderSide.BUY
+                order_result = await self._place_market_order(
+                    symbol=position.symbol,
+                    side=close_side,
+                    qty=position.quantity,
+                    reduce_only=True
+                )
+            except Exception as e:
+                logger.error("Error closing position: %s", e)
+                order_result, error = None, str(e)
+
+            if order_result is not None:
+                position.order_ids.append(order_result["orderId"])
+                exit_time = order_result["ack_time"]
+            else:
+                # The SL/TP attached to the entry may have closed the position on the
+                # exchange first, in which case the reduce-only close is rejected
+                exchange_exit = await self._exchange_exit(position, exit_price)
+                if exchange_exit is None:
+                    position.error_message = error
+                    position.status = PositionStatus.ERROR
+                    self._track_exit(position)
+                    return False
+
+                exit_price, exit_time = exchange_exit
+                logger.info(
+                    "Position %s was already closed on the exchange, recording its fill @ $%.2f",
+                    position_id, exit_price
+                )
+
         # Calculate PnL
         if position.side == "LONG":
             pnl = (exit_price - position.entry_price) * position.quantity
@@ -220,132 +456,156 @@ class TradeManager:
 
         # Update position
         position.exit_price = exit_price
-        position.exit_time = datetime.now()
+        position.exit_time = exit_time or datetime.now()
+        position.exit_mono_ns = time.monotonic_ns()
         position.pnl = pnl
         position.pnl_percent = pnl_percent
         position.status = PositionStatus.CLOSED
+        self._track_exit(position)
 
-        logger.info(
-            f"{'[DRY RUN] ' if self.dry_run else ''}Position closed: {position_id} | "
-            f"PnL: ${pnl:.2f} ({pnl_percent:.2f}%) | "
-            f"Duration: {(position.exit_time - position.entry_time).total_seconds() / 60:.1f}min"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%sPosition closed: %s | PnL: $%.2f (%.2f%%) | Duration: %.1fmin",
+                "[DRY RUN] " if self.dry_run else "", position_id, pnl, pnl_percent,
+                (position.exit_mono_ns - position.entry_mono_ns) / 60e9
+            )
 
-        if not self.dry_run:
-            # LIVE TRADING: Place closing market order
-            try:
-                # Placeholder for actual API call
-                logger.warning("Live trading not fully implemented - would close real position here")
-
-                # Actual implementation would be:
-                # close_side = OrderSide.SELL if position.side == "LONG" else OrderSide.BUY
-                # order_result = await self._place_market_order(
-                #     symbol=position.symbol,
-                #     side=close_side,
-                #     qty=position.quantity
-                # )
-                #
-                # Cancel any open SL/TP orders
-                # await self._cancel_orders(position.order_ids)
-
-                pass
+        return True
 
-            except Exception as e:
-                logger.error(f"Error closing position: {e}")
-                position.error_message = str(e)
-                position.status = PositionStatus.ERROR
-                return False
+    async def _exchange_exit(self, position: Position, exit_price: float) -> Optional[tuple[float, datetime]]:
+        """
+        (exit price, exit time) if the exchange shows the position already flat,
+        taken from its latest closed-PnL record; None if it is still open or unknown
+        """
+        if self.bybit_client is None:
+            return None
 
-        return True
+        exchange_position = await self.bybit_client.get_position(position.symbol)
+        if exchange_position is None:
+            return None
 
-    def check_stop_loss(self, current_price: float) -> List[str]:
-        """Check if any positions hit stop loss"""
-        closed_positions = []
+        entry_side = position.entry_order_side
+        if entry_side is None:
+            entry_side = OrderSide.BUY if position.side == "LONG" else OrderSide.SELL
+        if float(exchange_position.get("size") or 0) > 0 and exchange_position.get("side") == entry_side.value:
+            return None
 
-        for pos_id, position in self.positions.items():
-            if position.status != PositionStatus.OPEN or not position.stop_loss:
-                continue
+        record = await self.bybit_client.get_last_closed_pnl(position.symbol)
+        if record:
+            closed_at = datetime.fromtimestamp(int(record["updatedTime"]) / 1000)
+            if closed_at >= position.entry_time:
+                return float(record["avgExitPrice"]), closed_at
 
-            hit_stop = False
+        # Flat but no fill record for this position yet: keep the locally seen price
+        return exit_price, datetime.now()
 
-            if position.side == "LONG" and current_price <= position.stop_loss:
-                hit_stop = True
-            elif position.side == "SHORT" and current_price >= position.stop_loss:
-                hit_stop = True
+    def _sync_exit_arrays(self) -> bool:
+        """Rebuild the exit arrays if stale; returns whether any position is open"""
+        if self._exit_arrays_stale:
+            self._refresh_exit_arrays()
+        return bool(self._open_ids)
 
-            if hit_stop:
-                logger.warning(
-                    f"Stop loss hit for {pos_id} | "
-                    f"{position.side} @ ${position.entry_price:.2f} | "
-                    f"SL: ${position.stop_loss:.2f} | Current: ${current_price:.2f}"
-                )
+    def _close_stops(self, hits: np.ndarray, current_price: float) -> List[str]:
+        """Schedule stop-loss closes for the open-array indices in `hits`"""
+        closed_positions = []
 
-                asyncio.create_task(
-                    self.close_position(pos_id, position.stop_loss, "Stop loss hit")
-                )
-                closed_positions.append(pos_id)
+        for i in hits:
+            pos_id = self._open_ids[i]
+            position = self._open_positions[pos_id]
+            logger.warning(
+                "Stop loss hit for %s | %s @ $%.2f | SL: $%.2f | Current: $%.2f",
+                pos_id, position.side, position.entry_price, position.stop_loss, current_price
+            )
+
+            self._request_close(pos_id, position.stop_loss, "Stop loss hit")
+            closed_positions.append(pos_id)
 
         return closed_positions
 
-    def check_take_profit(self, current_price: float) -> List[str]:
-        """Check if any positions hit take profit"""
+    def _close_targets(self, hits: np.ndarray, current_price: float) -> List[str]:
+        """Schedule take-profit closes for the open-array indices in `hits`"""
         closed_positions = []
 
-        for pos_id, position in self.positions.items():
-            if position.status != PositionStatus.OPEN or not position.take_profit:
-                continue
+        for i in hits:
+            pos_id = self._open_ids[i]
+            position = self._open_positions[pos_id]
+            logger.info(
+                "Take profit hit for %s | %s @ $%.2f | TP: $%.2f | Current: $%.2f",
+                pos_id, position.side, position.entry_price, position.take_profit, current_price
+            )
 
-            hit_tp = False
+            self._request_close(pos_id, position.take_profit, "Take profit hit")
+            closed_positions.append(pos_id)
 
-            if position.side == "LONG" and current_price >= position.take_profit:
-                hit_tp = True
-            elif position.side == "SHORT" and current_price <= position.take_profit:
-                hit_tp = True
+        return closed_positions
 
-            if hit_tp:
-                logger.info(
-                    f"Take profit hit for {pos_id} | "
-                    f"{position.side} @ ${position.entry_price:.2f} | "
-                    f"TP: ${position.take_profit:.2f} | Current: ${current_price:.2f}"
-                )
+    def _on_symbol(self, hit: np.ndarray, symbol: Optional[str]) -> np.ndarray:
+        """Restrict an exit mask to positions on `symbol` (None checks every symbol)"""
+        if symbol is None:
+            return hit
+        return hit & (self._open_symbols == symbol)
 
-                asyncio.create_task(
-                    self.close_position(pos_id, position.take_profit, "Take profit hit")
-                )
-                closed_positions.append(pos_id)
+    def check_exits(self, current_price: float, symbol: Optional[str] = None) -> tuple[List[str], List[str]]:
+        """
+        Check stop loss and take profit for every open position in one pass.
+        Returns (stop_loss_hits, take_profit_hits); same results as calling
+        check_stop_loss then check_take_profit.
+        Pass `symbol` to only check positions priced by that symbol's feed.
+        """
+        if not self._sync_exit_arrays():
+            return [], []
 
-        return closed_positions
+        # LONG: SL hit at price <= SL, TP hit at price >= TP (mirrored for SHORT)
+        sl_hit = self._open_side_sign * (current_price - self._open_sl) <= 0
+        tp_hit = self._open_side_sign * (current_price - self._open_tp) >= 0
+
+        return (
+            self._close_stops(np.flatnonzero(self._on_symbol(sl_hit, symbol)), current_price),
+            self._close_targets(np.flatnonzero(self._on_symbol(tp_hit, symbol)), current_price),
+        )
+
+    def check_stop_loss(self, current_price: float, symbol: Optional[str] = None) -> List[str]:
+        """Check if any positions hit stop loss"""
+        if not self._sync_exit_arrays():
+            return []
+
+        # LONG: price <= SL, SHORT: price >= SL
+        hit = self._open_side_sign * (current_price - self._open_sl) <= 0
+        return self._close_stops(np.flatnonzero(self._on_symbol(hit, symbol)), current_price)
+
+    def check_take_profit(self, current_price: float, symbol: Optional[str] = None) -> List[str]:
+        """Check if any positions hit take profit"""
+        if not self._sync_exit_arrays():
+            return []
+
+        # LONG: price >= TP, SHORT: price <= TP
+        hit = self._open_side_sign * (current_price - self._open_tp) >= 0
+        return self._close_targets(np.flatnonzero(self._on_symbol(hit, symbol)), current_price)
 
     def get_open_positions(self) -> List[Position]:
         """Get all open positions"""
-        return [p for p in self.positions.values() if p.status == PositionStatus.OPEN]
+        return list(self._open_positions.values())
 
     def get_closed_positions(self) -> List[Position]:
         """Get all closed positions"""
-        return [p for p in self.positions.values() if p.status == PositionStatus.CLOSED]
+        return [p for p in self._finished_positions.values() if p.status == PositionStatus.CLOSED]
 
     def get_position_summary(self) -> Dict[str, Any]:
         """Get summary of all positions"""
-        open_positions = self.get_open_positions()
-        closed_positions = self.get_closed_positions()
-
-        total_pnl = sum(p.pnl for p in closed_positions)
-        winning_trades = [p for p in closed_positions if p.pnl > 0]
-        losing_trades = [p for p in closed_positions if p.pnl < 0]
-
-        win_rate = (
-            len(winning_trades) / len(closed_positions) * 100
-            if closed_positions else 0.0
-        )
+        closed_count = self._closed_count
+        win_rate = self._winning_count / closed_count * 100 if closed_count else 0.0
 
         return {
-            "open_positions": len(open_positions),
-            "closed_positions": len(closed_positions),
-            "total_trades": len(self.positions),
-            "total_pnl": total_pnl,
+            "open_positions": len(self._open_positions),
+            "closed_positions": closed_count,
+            # The stores are disjoint; len() of the ChainMap would build a union of every id
+            "total_trades": (
+                len(self._open_positions) + len(self._pending_positions) + len(self._finished_positions)
+            ),
+            "total_pnl": self._total_pnl,
             "win_rate": win_rate,
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
+            "winning_trades": self._winning_count,
+            "losing_trades": self._losing_count,
             "dry_run": self.dry_run
         }
 
@@ -353,6 +613,7 @@ class TradeManager:
         """Get trade manager status"""
         open_pos = self.get_open_positions()
         summary = self.get_position_summary()
+        now_ns = time.monotonic_ns()
 
         return {
             "mode": "DRY_RUN" if self.dry_run else "LIVE",
@@ -366,9 +627,7 @@ class TradeManager:
                     "quantity": p.quantity,
                     "stop_loss": p.stop_loss,
                     "take_profit": p.take_profit,
-                    "duration_minutes": (
-                        datetime.now() - p.entry_time
-                    ).total_seconds() / 60,
+                    "duration_minutes": (now_ns - p.entry_mono_ns) / 60e9,
                     "reason": p.signal_reason
                 }
                 for p in open_pos
@@ -0,0 +1,25 @@
+"""
+Optional Numba JIT support
+numba is not a hard dependency: when it is missing, `njit` is a no-op decorator
+and callers should prefer their NumPy code path (check NUMBA_AVAILABLE).
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit: return the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
@@ -0,0 +1,70 @@
+"""
+Fixed-capacity kline history backed by preallocated NumPy columns
+Shared by engines that run rolling reductions over recent candles
+"""
+
+import numpy as np
+
+from src.models import OHLCV
+
+
+class KlineBuffer:
+    """
+    Structure-of-arrays kline history: one float64 column per OHLCV field.
+    Rows are written twice (at i and i + capacity) so the most recent candles
+    are always one contiguous, chronological slice of each column.
+    """
+
+    FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+    __slots__ = ("capacity", "_buf", "_idx", "_n")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.empty((len(self.FIELDS), 2 * capacity), dtype=np.float64)
+        self._idx = 0
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, kline: OHLCV):
+        row = (
+            kline.timestamp.timestamp(), kline.open, kline.high,
+            kline.low, kline.close, kline.volume
+        )
+        i = self._idx
+        self._buf[:, i] = row
+        self._buf[:, i + self.capacity] = row
+        self._idx = (i + 1) % self.capacity
+        if self._n < self.capacity:
+            self._n += 1
+
+    def _column(self, field: int) -> np.ndarray:
+        """Oldest-to-newest values of one field (a view, not a copy)"""
+        end = self._idx + self.capacity
+        return self._buf[field, end - self._n:end]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._column(0)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._column(1)
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._column(2)
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._column(3)
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._column(4)
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._column(5)
@@ -0,0 +1,66 @@
+"""
+Async token-bucket rate limiter
+Shared by outbound API clients to stay under provider quotas
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio callers
+
+    - `rate` tokens are refilled every `per` seconds, up to `burst` tokens
+    - acquire() waits until a token is available; waiters are served in order
+    - penalize() blocks all acquires for a cool-down (e.g. a 429 Retry-After)
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: int = 1):
+        self.refill_per_sec = rate / per
+        self.burst = float(burst)
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.refill_per_sec)
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available (refilled up to now)"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def blocked(self) -> bool:
+        """Whether a penalize() cool-down is still in effect"""
+        return time.monotonic() < self._blocked_until
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+
+                await asyncio.sleep((1.0 - self._tokens) / self.refill_per_sec)
+
+    def penalize(self, delay: float) -> None:
+        """Drain the bucket and block acquires for `delay` seconds"""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + delay)
@@ -0,0 +1,62 @@
+"""
+Fixed-capacity float history backed by a preallocated NumPy array
+"""
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Float64 ring buffer with O(1) append.
+    Values are written twice (at i and i + capacity) so the most recent
+    values are always one contiguous, chronological slice.
+    """
+
+    __slots__ = ("capacity", "_buf", "_idx", "_n")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.empty(2 * capacity, dtype=np.float64)
+        self._idx = 0
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, value: float):
+        i = self._idx
+        self._buf[i] = value
+        self._buf[i + self.capacity] = value
+        self._idx = (i + 1) % self.capacity
+        if self._n < self.capacity:
+            self._n += 1
+
+    def extend(self, values) -> None:
+        """Append many values at once with slice stores; only the newest `capacity` are kept"""
+        vals = np.asarray(values, dtype=np.float64)
+        k = len(vals)
+        if k == 0:
+            return
+
+        cap = self.capacity
+        if k > cap:
+            vals = vals[-cap:]
+        m = len(vals)
+        start = (self._idx + k - m) % cap
+
+        # Up to the end of the first copy, then wrap to the front
+        first = min(m, cap - start)
+        self._buf[start:start + first] = vals[:first]
+        self._buf[start + cap:start + cap + first] = vals[:first]
+        rest = m - first
+        self._buf[:rest] = vals[first:]
+        self._buf[cap:cap + rest] = vals[first:]
+
+        self._idx = (self._idx + k) % cap
+        self._n = min(cap, self._n + k)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Oldest-to-newest values (a view, not a copy)"""
+        end = self._idx + self.capacity
+        return self._buf[end - self._n:end]